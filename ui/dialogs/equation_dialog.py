@@ -6,7 +6,10 @@ Provides a preview of the rendered equation.
 """
 
 from __future__ import annotations
+from functools import lru_cache
+from io import BytesIO
 from typing import Optional
+import threading
 
 from PyQt6.QtWidgets import (
     QDialog,
@@ -24,6 +27,64 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont, QImage, QPixmap
 
 
+# Every matplotlib use in the application goes through this lock: the
+# warm-up thread and the GUI thread must not run it concurrently
+_MATPLOTLIB_LOCK = threading.Lock()
+_matplotlib_warm_started = False
+
+
+# Rendered equations: 14 pt text, 150 dpi, transparent, 0.1 in padding
+_LATEX_FONT_SIZE = 14
+_LATEX_DPI = 150
+_LATEX_PAD_POINTS = 0.1 * 72
+
+
+@lru_cache(maxsize=256)
+def render_latex_png(latex: str) -> bytes:
+    """Render a LaTeX expression to PNG bytes with matplotlib's mathtext."""
+    with _MATPLOTLIB_LOCK:
+        # mathtext measures the expression directly, so the figure is sized
+        # up front without pyplot, a canvas draw or a tight-bbox pass
+        from matplotlib.figure import Figure
+        from matplotlib.font_manager import FontProperties
+        from matplotlib.mathtext import MathTextParser
+        
+        text = f"${latex}$"
+        prop = FontProperties(size=_LATEX_FONT_SIZE)
+        width, height, depth = MathTextParser("path").parse(text, dpi=72, prop=prop)[:3]
+        
+        pad = _LATEX_PAD_POINTS
+        figure_width = width + 2 * pad
+        figure_height = height + 2 * pad
+        figure = Figure(figsize=(figure_width / 72, figure_height / 72))
+        figure.text(
+            pad / figure_width,
+            (pad + depth) / figure_height,
+            text,
+            fontproperties=prop,
+        )
+        
+        buffer = BytesIO()
+        figure.savefig(buffer, dpi=_LATEX_DPI, format="png", transparent=True)
+        return buffer.getvalue()
+
+
+def warm_latex_renderer() -> None:
+    """Import matplotlib and load its font cache on a background thread, once."""
+    global _matplotlib_warm_started
+    if _matplotlib_warm_started:
+        return
+    _matplotlib_warm_started = True
+    
+    def _render_once() -> None:
+        try:
+            render_latex_png("x")
+        except Exception:
+            pass  # Missing or broken matplotlib is reported on first use
+    
+    threading.Thread(target=_render_once, name="matplotlib-warmup", daemon=True).start()
+
+
 class EquationDialog(QDialog):
     """
     Dialog for entering and previewing LaTeX equations.
@@ -73,6 +134,9 @@ class EquationDialog(QDialog):
         
         self._setup_ui()
         self._connect_signals()
+        
+        # Load matplotlib while the user types, only once equations are used
+        warm_latex_renderer()
     
     def _setup_ui(self) -> None:
         """Set up dialog UI."""
@@ -171,37 +235,9 @@ class EquationDialog(QDialog):
             return
         
         try:
-            import matplotlib
-            matplotlib.use('Agg')
-            import matplotlib.pyplot as plt
-            from io import BytesIO
-            
-            fig, ax = plt.subplots(figsize=(0.01, 0.01))
-            ax.axis('off')
-            
-            # Render the LaTeX
-            text = ax.text(0.5, 0.5, f"${latex}$", 
-                          transform=ax.transAxes,
-                          fontsize=16,
-                          ha='center', va='center')
-            
-            # Get bounding box
-            fig.canvas.draw()
-            bbox = text.get_window_extent(fig.canvas.get_renderer())
-            
-            # Resize figure
-            fig.set_size_inches(bbox.width / fig.dpi + 0.4, bbox.height / fig.dpi + 0.4)
-            
-            # Save to buffer
-            buffer = BytesIO()
-            fig.savefig(buffer, format='png', dpi=150, 
-                       bbox_inches='tight', pad_inches=0.2,
-                       facecolor='white', edgecolor='none')
-            plt.close(fig)
-            
-            buffer.seek(0)
+            # Same renderer and settings as the inserted image
             image = QImage()
-            image.loadFromData(buffer.getvalue())
+            image.loadFromData(render_latex_png(latex))
             
             if not image.isNull():
                 pixmap = QPixmap.fromImage(image)
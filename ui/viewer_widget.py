@@ -5,8 +5,9 @@ The main PDF viewing widget with annotation support.
 """
 
 from __future__ import annotations
+import math
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Set, Tuple
 
 from PyQt6.QtWidgets import (
     QWidget,
@@ -17,12 +18,14 @@ from PyQt6.QtWidgets import (
     QInputDialog,
     QMessageBox,
 )
-from PyQt6.QtCore import Qt, QPoint, QPointF, QRect, QSize, pyqtSignal, QTimer
+from PyQt6.QtCore import Qt, QPoint, QPointF, QRect, QRectF, QSize, pyqtSignal, QTimer
 from PyQt6.QtGui import (
     QImage,
     QPixmap,
     QPainter,
+    QPainterPath,
     QPen,
+    QPolygon,
     QBrush,
     QColor,
     QCursor,
@@ -33,11 +36,94 @@ from PyQt6.QtGui import (
     QResizeEvent,
 )
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional - fall back to NumPy slices
+    njit = None
+
 from core.pdf_engine import PDFEngine
 from core.render_engine import RenderEngine
 from models.annotation import AnnotationBase, AnnotationType
 
 
+def _segment_distance_sq(
+    px: float,
+    py: float,
+    ax: float,
+    ay: float,
+    bx: float,
+    by: float,
+) -> float:
+    """Squared distance from (px, py) to the segment (ax, ay)-(bx, by)."""
+    dx = bx - ax
+    dy = by - ay
+    
+    # Zero-length segments fall out of the clamp (t == 0) without a branch
+    len2 = dx * dx + dy * dy or 1.0
+    
+    # Projection parameter scaled by len2, clamped to the segment
+    t = (px - ax) * dx + (py - ay) * dy
+    t = 0.0 if t < 0 else (len2 if t > len2 else t)
+    
+    qx = px * len2 - (ax * len2 + t * dx)
+    qy = py * len2 - (ay * len2 + t * dy)
+    
+    return (qx * qx + qy * qy) / (len2 * len2)
+
+
+def _polyline_distance_sq(points: np.ndarray, px: float, py: float) -> np.ndarray:
+    """Squared distance from (px, py) to each segment of an (N, 2) polyline."""
+    a = points[:-1].astype(np.float64)
+    d = points[1:] - a
+    len2 = (d * d).sum(axis=1)
+    len2[len2 == 0] = 1.0
+    
+    t = np.clip(((px - a[:, 0]) * d[:, 0] + (py - a[:, 1]) * d[:, 1]) / len2, 0.0, 1.0)
+    qx = a[:, 0] + t * d[:, 0] - px
+    qy = a[:, 1] + t * d[:, 1] - py
+    return qx * qx + qy * qy
+
+
+def _strokes_hit_numpy(
+    points: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    px: int,
+    py: int,
+    r2: int,
+) -> np.ndarray:
+    """Flag strokes that pass within sqrt(r2) of (px, py)."""
+    out = np.zeros(starts.size, dtype=np.bool_)
+    for s in range(starts.size):
+        stroke = points[starts[s]:ends[s]]
+        out[s] = bool(np.any(_polyline_distance_sq(stroke, px, py) < r2))
+    return out
+
+
+if njit is not None:
+    _segment_distance_sq_jit = njit(cache=True)(_segment_distance_sq)
+    
+    @njit(cache=True, fastmath=True)
+    def strokes_hit(points, starts, ends, px, py, r2):
+        """Flag strokes that pass within sqrt(r2) of (px, py)."""
+        out = np.zeros(starts.size, np.bool_)
+        for s in range(starts.size):
+            for i in range(starts[s], ends[s] - 1):
+                d2 = _segment_distance_sq_jit(
+                    px, py,
+                    points[i, 0], points[i, 1],
+                    points[i + 1, 0], points[i + 1, 1],
+                )
+                if d2 < r2:
+                    out[s] = True
+                    break
+        return out
+else:
+    strokes_hit = _strokes_hit_numpy
+
+
 class ViewerWidget(QWidget):
     """
     PDF viewer widget with annotation support.
@@ -61,6 +147,15 @@ class ViewerWidget(QWidget):
     MAX_ZOOM = 5.0
     ZOOM_STEP = 0.1
     
+    # Drawing cache - pooled raster images kept for reuse, and extra margin around
+    # drawing bboxes so pen width and arrowheads are not clipped
+    IMAGE_POOL_SIZE = 1
+    DRAWING_CACHE_MARGIN = 16
+    
+    # Eraser hit testing (cell size ~2x radius so a 3x3 lookup covers the radius)
+    ERASER_RADIUS = 10
+    ERASE_CELL_SIZE = 20
+    
     def __init__(
         self,
         file_path: Path,
@@ -94,12 +189,16 @@ class ViewerWidget(QWidget):
         self._drag_start_pos = QPoint()
         self._drag_start_scroll = QPoint()
         
+        # Page offset cache - (key, (x, y)), key covers everything the offset depends on
+        self._offset_cache: tuple = (None, None)
+        
         # Current tool
         self._current_tool = "draw"
         
         # Drawing settings
         self._stroke_color = QColor(255, 0, 0)
         self._fill_color = QColor(255, 255, 0, 128)
+        self._fill_brush = QBrush(self._fill_color)
         self._stroke_width = 2
         
         # Lens tool settings
@@ -108,6 +207,7 @@ class ViewerWidget(QWidget):
         self._lens_active = False
         self._lens_view_pos = QPointF(0.5, 0.5)  # Normalized position (0-1) on page
         self._lens_dragging = False
+        self._last_lens_rect = QRect()  # Area repainted for the last lens move
         
         # Annotations
         self._annotations: List[AnnotationBase] = []
@@ -117,13 +217,27 @@ class ViewerWidget(QWidget):
         # Drawing state
         self._is_drawing = False
         self._drawings_visible = True  # Toggle to show/hide drawings
-        self._draw_points: List[QPoint] = []
+        # In-progress freehand stroke: (capacity, 2) int32 buffer, first _draw_count rows used
+        self._draw_points = np.zeros((256, 2), dtype=np.int32)
+        self._draw_count = 0
+        self._stroke_offset: Optional[tuple] = None  # Page offset cached for the stroke
         self._draw_start_pos: Optional[QPoint] = None
         self._draw_end_pos: Optional[QPoint] = None
+        self._preview_rect = QRect()  # Normalized start/end rect for shape previews
         
         # Page drawings - Dict[page_num, List[drawing_data]]
         self._page_drawings: Dict[int, List[dict]] = {}
         
+        # Eraser grid index - Dict[page_num, Dict[cell, List[drawing_index]]]
+        self._erase_index: Dict[int, Dict[Tuple[int, int], List[int]]] = {}
+        
+        # Rendered drawings - Dict[page_num, (origin, pixmap)], current page only
+        self._drawing_cache: Dict[int, Tuple[QPoint, QPixmap]] = {}
+        self._image_pool: List[QImage] = []
+        
+        # Packed freehand points per page - (points, starts, ends) by drawing index
+        self._stroke_buffers: Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        
         # Undo/redo stacks
         self._undo_stack: List[dict] = []
         self._redo_stack: List[dict] = []
@@ -131,6 +245,9 @@ class ViewerWidget(QWidget):
         # Changes tracking
         self._has_changes = False
         
+        # Repaint coalescing for mouse-driven updates
+        self._update_pending = False
+        
         self._setup_ui()
     
     def _setup_ui(self) -> None:
@@ -203,7 +320,10 @@ class ViewerWidget(QWidget):
         
         self._page_pixmaps.clear()
         self._page_sizes.clear()
+        self._offset_cache = (None, None)
         self._annotations.clear()
+        self._drawing_cache.clear()
+        self._image_pool.clear()
         self._undo_stack.clear()
         self._redo_stack.clear()
         self._has_changes = False
@@ -253,6 +373,8 @@ class ViewerWidget(QWidget):
         # Store in cache
         self._page_pixmaps[self._current_page] = QPixmap.fromImage(qimage)
         self._page_zoom_levels[self._current_page] = self._zoom_level
+        self._offset_cache = (None, None)
+        self._invalidate_drawing_cache(self._current_page)
         
         self.update()
     
@@ -358,7 +480,12 @@ class ViewerWidget(QWidget):
     def set_current_tool(self, tool: str) -> None:
         """Set the current tool."""
         self._current_tool = tool
-        self._lens_active = (tool == "lens")
+        
+        # Lens view switches the whole widget layout; mouse moves no longer repaint it
+        lens_active = (tool == "lens")
+        if lens_active != self._lens_active:
+            self._lens_active = lens_active
+            self.update()
         
         # Update cursor based on tool
         if tool == "draw":
@@ -381,6 +508,7 @@ class ViewerWidget(QWidget):
     def set_fill_color(self, color: QColor) -> None:
         """Set the fill color for drawing."""
         self._fill_color = color
+        self._fill_brush = QBrush(color)
     
     def set_stroke_width(self, width: int) -> None:
         """Set the stroke width for drawing."""
@@ -396,6 +524,9 @@ class ViewerWidget(QWidget):
         """Clear all drawings on the current page."""
         if self._current_page in self._page_drawings:
             self._page_drawings[self._current_page].clear()
+            self._erase_index.pop(self._current_page, None)
+            self._stroke_buffers.pop(self._current_page, None)
+            self._invalidate_drawing_cache(self._current_page)
             self._has_changes = True
             self.update()
     
@@ -414,7 +545,6 @@ class ViewerWidget(QWidget):
         self.update()
         return self._drawings_visible
     
-    # Annotation methods
     def save_annotations(self) -> bool:
         """Save annotations to database."""
         # TODO: Implement annotation persistence
@@ -508,38 +638,33 @@ class ViewerWidget(QWidget):
         # Draw background
         painter.fillRect(self.rect(), QColor(64, 64, 64))
         
+        pixmap = self._page_pixmaps.get(self._current_page)
+        
         # If lens tool is active, render split view
-        if self._lens_active and self._current_page in self._page_pixmaps:
+        if self._lens_active and pixmap is not None:
             self._draw_lens_view(painter)
             painter.end()
             return
         
         # Draw page
-        if self._current_page in self._page_pixmaps:
-            pixmap = self._page_pixmaps[self._current_page]
-            
-            # Calculate centered position with scroll offset
-            # X is always centered (no horizontal scroll for now)
-            x = (self.width() - pixmap.width()) // 2
+        if pixmap is not None:
+            page_width = pixmap.width()
+            page_height = pixmap.height()
             
-            # Y position: center if page fits, otherwise apply scroll
-            if pixmap.height() <= self.height() - 20:
-                # Page fits vertically - center it
-                y = (self.height() - pixmap.height()) // 2
-            else:
-                # Page doesn't fit - start from top with scroll offset
-                y = 20 - self._scroll_offset.y()
+            # Centered position with scroll offset
+            x, y = self._get_page_offset()
             
             # Draw shadow
-            shadow_rect = QRect(x + 4, y + 4, pixmap.width(), pixmap.height())
+            shadow_rect = QRect(x + 4, y + 4, page_width, page_height)
             painter.fillRect(shadow_rect, QColor(0, 0, 0, 60))
             
             # Draw white page background
-            page_rect = QRect(x, y, pixmap.width(), pixmap.height())
+            page_rect = QRect(x, y, page_width, page_height)
             painter.fillRect(page_rect, QColor(255, 255, 255))
             
-            # Draw page content
-            painter.drawPixmap(x, y, pixmap)
+            # Draw page content (skipped when only an area off the page is dirty)
+            if event.rect().intersects(page_rect):
+                painter.drawPixmap(x, y, pixmap)
             
             # Draw saved drawings for this page (if visible)
             if self._drawings_visible:
@@ -561,8 +686,11 @@ class ViewerWidget(QWidget):
     def _draw_lens_view(self, painter: QPainter) -> None:
         """Draw the lens split-view with full page on left and zoomed section in center."""
         pixmap = self._page_pixmaps[self._current_page]
+        pixmap_width = pixmap.width()
+        pixmap_height = pixmap.height()
         widget_width = self.width()
         widget_height = self.height()
+        lens_zoom = self._lens_zoom
         
         # Calculate layout: left panel (20% width) for thumbnail, center for zoomed view
         left_panel_width = int(widget_width * 0.20)
@@ -575,12 +703,12 @@ class ViewerWidget(QWidget):
         available_width = left_panel_width - margin * 2
         available_height = widget_height - margin * 2
         
-        scale_w = available_width / pixmap.width()
-        scale_h = available_height / pixmap.height()
+        scale_w = available_width / pixmap_width
+        scale_h = available_height / pixmap_height
         thumb_scale = min(scale_w, scale_h)
         
-        thumb_width = int(pixmap.width() * thumb_scale)
-        thumb_height = int(pixmap.height() * thumb_scale)
+        thumb_width = int(pixmap_width * thumb_scale)
+        thumb_height = int(pixmap_height * thumb_scale)
         thumb_x = margin + (available_width - thumb_width) // 2
         thumb_y = margin + (available_height - thumb_height) // 2
         
@@ -598,19 +726,19 @@ class ViewerWidget(QWidget):
         painter.drawRect(thumb_x - 1, thumb_y - 1, thumb_width + 2, thumb_height + 2)
         
         # === Calculate view position on original pixmap using normalized position ===
-        mouse_on_pixmap_x = self._lens_view_pos.x() * pixmap.width()
-        mouse_on_pixmap_y = self._lens_view_pos.y() * pixmap.height()
+        mouse_on_pixmap_x = self._lens_view_pos.x() * pixmap_width
+        mouse_on_pixmap_y = self._lens_view_pos.y() * pixmap_height
         
         # === Calculate zoomed view dimensions ===
         # Width always fills the center panel, height shrinks with higher zoom
         zoomed_display_width = center_panel_width - 20  # Leave some margin
         
         # Calculate how much of the original page width we're viewing
-        original_view_width = zoomed_display_width / self._lens_zoom
+        original_view_width = zoomed_display_width / lens_zoom
         # Keep aspect ratio - height is proportional
         original_view_height = original_view_width * (widget_height - 60) / zoomed_display_width
         # But limit by zoom level - higher zoom = less height
-        original_view_height = min(original_view_height, pixmap.height() / self._lens_zoom)
+        original_view_height = min(original_view_height, pixmap_height / lens_zoom)
         
         # Position of view rect on original (centered on view position)
         view_left = mouse_on_pixmap_x - original_view_width / 2
@@ -642,16 +770,16 @@ class ViewerWidget(QWidget):
             src_x = 0
         if src_y < 0:
             src_y = 0
-        if src_x + src_width > pixmap.width():
-            src_width = pixmap.width() - src_x
-        if src_y + src_height > pixmap.height():
-            src_height = pixmap.height() - src_y
+        if src_x + src_width > pixmap_width:
+            src_width = pixmap_width - src_x
+        if src_y + src_height > pixmap_height:
+            src_height = pixmap_height - src_y
         
         if src_width > 0 and src_height > 0:
             # Extract and scale the portion - width fills panel, height based on zoom
             zoomed_portion = pixmap.copy(src_x, src_y, src_width, src_height)
-            scaled_width = int(src_width * self._lens_zoom)
-            scaled_height = int(src_height * self._lens_zoom)
+            scaled_width = int(src_width * lens_zoom)
+            scaled_height = int(src_height * lens_zoom)
             
             scaled_portion = zoomed_portion.scaled(
                 scaled_width,
@@ -683,7 +811,7 @@ class ViewerWidget(QWidget):
         font.setPointSize(12)
         font.setBold(True)
         painter.setFont(font)
-        painter.drawText(center_panel_x + 10, 30, f"Zoom: {self._lens_zoom:.0f}x")
+        painter.drawText(center_panel_x + 10, 30, f"Zoom: {lens_zoom:.0f}x")
         
         # Draw instructions
         font.setPointSize(10)
@@ -697,36 +825,132 @@ class ViewerWidget(QWidget):
 
     def _draw_page_drawings(self, painter: QPainter, offset_x: int, offset_y: int) -> None:
         """Draw saved drawings on the current page."""
-        if self._current_page not in self._page_drawings:
+        cache = self._drawing_cache.get(self._current_page)
+        if cache is None:
+            cache = self._build_drawing_cache(self._current_page)
+            if cache is None:
+                return
+        
+        origin, pixmap = cache
+        
+        # Blit only the part of the cache inside the viewport (page coordinates)
+        viewport = QRect(-offset_x, -offset_y, self.width(), self.height())
+        cache_rect = QRect(origin, pixmap.deviceIndependentSize().toSize())
+        visible = cache_rect.intersected(viewport)
+        if visible.isEmpty():
             return
         
-        for drawing in self._page_drawings[self._current_page]:
-            self._render_drawing(painter, drawing, offset_x, offset_y)
+        dpr = pixmap.devicePixelRatio()
+        source = visible.translated(-origin.x(), -origin.y())
+        painter.drawPixmap(
+            QRectF(visible.translated(offset_x, offset_y)),
+            pixmap,
+            QRectF(source.x() * dpr, source.y() * dpr, source.width() * dpr, source.height() * dpr),
+        )
     
-    def _render_drawing(self, painter: QPainter, drawing: dict, offset_x: int, offset_y: int) -> None:
-        """Render a single drawing."""
-        tool = drawing.get("tool")
-        color = drawing.get("color", QColor(255, 0, 0))
-        fill_color = drawing.get("fill_color", QColor(255, 255, 0, 128))
-        width = drawing.get("width", 2)
+    def _build_drawing_cache(self, page: int) -> Optional[Tuple[QPoint, QPixmap]]:
+        """Render a page's saved drawings into an off-screen pixmap.
+        
+        Drawing happens on a premultiplied ARGB32 QImage, which the raster
+        engine paints fastest, and is converted to a QPixmap once at the end.
+        """
+        drawings = self._page_drawings.get(page)
+        page_pixmap = self._page_pixmaps.get(page)
+        if not drawings or page_pixmap is None:
+            return None
+        
+        # Cover the page plus anything drawn past its edges
+        bounds = QRect(0, 0, page_pixmap.width(), page_pixmap.height())
+        for drawing in drawings:
+            bbox = drawing.get("bbox")
+            if bbox is not None:
+                margin = drawing.get("width", 2) + self.DRAWING_CACHE_MARGIN
+                bounds = bounds.united(bbox.adjusted(-margin, -margin, margin, margin))
+        
+        dpr = self.devicePixelRatioF()
+        image = self._acquire_image(
+            QSize(int(bounds.width() * dpr), int(bounds.height() * dpr))
+        )
+        image.setDevicePixelRatio(dpr)
+        
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        # Pen/brush only change between consecutive drawings of different style,
+        # keeping the original stacking order
+        render_drawing = self._render_drawing
+        current_style = None
+        for drawing in drawings:
+            style = drawing.get("style")
+            if style is None or style != current_style:
+                self._apply_drawing_style(painter, drawing)
+                current_style = style
+            render_drawing(painter, drawing, -bounds.x(), -bounds.y())
+        painter.end()
+        
+        cache = (bounds.topLeft(), QPixmap.fromImage(image))
+        self._release_image(image)
+        # Only the current page is ever painted; don't keep page-sized
+        # pixmaps alive for every page visited
+        self._drawing_cache.clear()
+        self._drawing_cache[page] = cache
+        return cache
+    
+    def _invalidate_drawing_cache(self, page: int) -> None:
+        """Drop a page's drawing cache so it is rebuilt on the next paint."""
+        self._drawing_cache.pop(page, None)
+    
+    def _acquire_image(self, size: QSize) -> QImage:
+        """Take a cleared image of the given size from the pool, or allocate one."""
+        for i, pooled in enumerate(self._image_pool):
+            if pooled.size() == size:
+                image = self._image_pool.pop(i)
+                break
+        else:
+            image = QImage(size, QImage.Format.Format_ARGB32_Premultiplied)
         
-        pen = QPen(color)
-        pen.setWidth(width)
+        image.fill(0)
+        return image
+    
+    def _release_image(self, image: QImage) -> None:
+        """Return a scratch image to the pool, evicting the oldest entry."""
+        self._image_pool.append(image)
+        if len(self._image_pool) > self.IMAGE_POOL_SIZE:
+            self._image_pool.pop(0)
+    
+    def _apply_drawing_style(self, painter: QPainter, drawing: dict) -> None:
+        """Set the painter pen and brush for a drawing."""
+        pen = QPen(drawing.get("color", QColor(255, 0, 0)))
+        pen.setWidth(drawing.get("width", 2))
         pen.setCapStyle(Qt.PenCapStyle.RoundCap)
         pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
         painter.setPen(pen)
         
+        # Only shapes are filled; freehand paths and lines never use the brush
+        fill_color = drawing.get("fill_color")
+        if fill_color is not None:
+            painter.setBrush(QBrush(fill_color))
+        else:
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+    
+    def _drawing_style(self, drawing: dict) -> tuple:
+        """Get the key identifying a drawing's pen and brush."""
+        color = drawing.get("color")
+        fill_color = drawing.get("fill_color")
+        return (
+            color.rgba() if color is not None else None,
+            drawing.get("width", 2),
+            fill_color.rgba() if fill_color is not None else None,
+        )
+    
+    def _render_drawing(self, painter: QPainter, drawing: dict, offset_x: int, offset_y: int) -> None:
+        """Render a single drawing with the painter's current pen and brush."""
+        tool = drawing.get("tool")
+        
         if tool == "draw":
-            # Freehand drawing - list of points
-            points = drawing.get("points", [])
-            if len(points) >= 2:
-                for i in range(1, len(points)):
-                    p1 = points[i - 1]
-                    p2 = points[i]
-                    painter.drawLine(
-                        p1.x() + offset_x, p1.y() + offset_y,
-                        p2.x() + offset_x, p2.y() + offset_y
-                    )
+            # Freehand drawing - path prebuilt in page coordinates
+            path = drawing.get("path")
+            if path is not None:
+                painter.drawPath(path.translated(offset_x, offset_y))
         
         elif tool == "rectangle":
             rect = drawing.get("rect")
@@ -737,7 +961,6 @@ class ViewerWidget(QWidget):
                     rect.width(),
                     rect.height()
                 )
-                painter.setBrush(QBrush(fill_color))
                 painter.drawRect(adjusted_rect)
         
         elif tool == "ellipse":
@@ -749,7 +972,6 @@ class ViewerWidget(QWidget):
                     rect.width(),
                     rect.height()
                 )
-                painter.setBrush(QBrush(fill_color))
                 painter.drawEllipse(adjusted_rect)
         
         elif tool == "line":
@@ -770,13 +992,17 @@ class ViewerWidget(QWidget):
                     start.x() + offset_x, start.y() + offset_y,
                     end.x() + offset_x, end.y() + offset_y
                 )
-                # Draw arrowhead
-                self._draw_arrowhead(painter, start, end, offset_x, offset_y)
+                # Draw precomputed arrowhead
+                head = drawing.get("head")
+                if head is not None:
+                    painter.drawPolyline(head.translated(offset_x, offset_y))
     
     def _draw_arrowhead(self, painter: QPainter, start: QPoint, end: QPoint, offset_x: int, offset_y: int) -> None:
         """Draw arrowhead at the end point."""
-        import math
-        
+        painter.drawPolyline(self._compute_arrowhead(start, end).translated(offset_x, offset_y))
+    
+    def _compute_arrowhead(self, start: QPoint, end: QPoint) -> QPolygon:
+        """Compute the open arrowhead polyline (wing, tip, wing) at the end point."""
         # Calculate angle
         dx = end.x() - start.x()
         dy = end.y() - start.y()
@@ -792,15 +1018,7 @@ class ViewerWidget(QWidget):
         x2 = end.x() - arrow_length * math.cos(angle + arrow_angle)
         y2 = end.y() - arrow_length * math.sin(angle + arrow_angle)
         
-        # Draw arrowhead lines
-        painter.drawLine(
-            end.x() + offset_x, end.y() + offset_y,
-            int(x1) + offset_x, int(y1) + offset_y
-        )
-        painter.drawLine(
-            end.x() + offset_x, end.y() + offset_y,
-            int(x2) + offset_x, int(y2) + offset_y
-        )
+        return QPolygon([QPoint(int(x1), int(y1)), QPoint(end), QPoint(int(x2), int(y2))])
     
     def _draw_current_drawing(self, painter: QPainter, offset_x: int, offset_y: int) -> None:
         """Draw the current drawing in progress."""
@@ -810,15 +1028,10 @@ class ViewerWidget(QWidget):
         pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
         painter.setPen(pen)
         
-        if self._current_tool == "draw" and self._draw_points:
+        if self._current_tool == "draw" and self._draw_count:
             # Freehand drawing - points are in page coordinates, add offset for display
-            for i in range(1, len(self._draw_points)):
-                p1 = self._draw_points[i - 1]
-                p2 = self._draw_points[i]
-                painter.drawLine(
-                    p1.x() + offset_x, p1.y() + offset_y,
-                    p2.x() + offset_x, p2.y() + offset_y
-                )
+            polygon = self._points_to_polygon(self._draw_points[:self._draw_count])
+            painter.drawPolyline(polygon.translated(offset_x, offset_y))
         
         elif self._current_tool in ("rectangle", "ellipse", "line", "arrow"):
             if self._draw_start_pos and self._draw_end_pos:
@@ -826,14 +1039,12 @@ class ViewerWidget(QWidget):
                 end = self._draw_end_pos
                 
                 if self._current_tool == "rectangle":
-                    rect = QRect(start, end).normalized()
-                    painter.setBrush(QBrush(self._fill_color))
-                    painter.drawRect(rect)
+                    painter.setBrush(self._fill_brush)
+                    painter.drawRect(self._preview_rect)
                 
                 elif self._current_tool == "ellipse":
-                    rect = QRect(start, end).normalized()
-                    painter.setBrush(QBrush(self._fill_color))
-                    painter.drawEllipse(rect)
+                    painter.setBrush(self._fill_brush)
+                    painter.drawEllipse(self._preview_rect)
                 
                 elif self._current_tool == "line":
                     painter.drawLine(start, end)
@@ -867,31 +1078,42 @@ class ViewerWidget(QWidget):
         offset_y: int,
     ) -> None:
         """Draw the current drawing path (legacy, kept for compatibility)."""
-        if len(self._draw_points) < 2:
+        if self._draw_count < 2:
             return
         
         pen = QPen(self._stroke_color)
         pen.setWidth(self._stroke_width)
         painter.setPen(pen)
-        
-        for i in range(1, len(self._draw_points)):
-            p1 = self._draw_points[i - 1]
-            p2 = self._draw_points[i]
-            painter.drawLine(p1, p2)
+        painter.drawPolyline(self._points_to_polygon(self._draw_points[:self._draw_count]))
     
     def _get_page_offset(self) -> tuple:
         """Get the current page offset for coordinate conversion."""
+        key = (
+            self._current_page,
+            self._zoom_level,
+            self.width(),
+            self.height(),
+            self._scroll_offset.y(),
+        )
+        cached_key, cached_offset = self._offset_cache
+        if cached_key == key:
+            return cached_offset
+        
         if self._current_page not in self._page_pixmaps:
             return 0, 0
         
         pixmap = self._page_pixmaps[self._current_page]
+        
+        # X is always centered (no horizontal scroll for now)
         x = (self.width() - pixmap.width()) // 2
         
+        # Y position: center if page fits, otherwise start from top with scroll offset
         if pixmap.height() <= self.height() - 20:
             y = (self.height() - pixmap.height()) // 2
         else:
             y = 20 - self._scroll_offset.y()
         
+        self._offset_cache = (key, (x, y))
         return x, y
     
     def _screen_to_page_coords(self, pos: QPoint) -> QPoint:
@@ -911,13 +1133,16 @@ class ViewerWidget(QWidget):
             if self._current_tool == "draw":
                 self._is_drawing = True
                 # Convert to page coordinates
-                page_pos = self._screen_to_page_coords(event.pos())
-                self._draw_points = [page_pos]
+                offset_x, offset_y = self._stroke_offset = self._get_page_offset()
+                pos = event.pos()
+                self._draw_count = 0
+                self._append_draw_point(pos.x() - offset_x, pos.y() - offset_y)
             
             elif self._current_tool in ("rectangle", "ellipse", "line", "arrow"):
                 self._is_drawing = True
                 self._draw_start_pos = event.pos()
                 self._draw_end_pos = event.pos()
+                self._preview_rect = QRect(self._draw_start_pos, self._draw_end_pos).normalized()
             
             elif self._current_tool == "eraser":
                 # Try to erase drawing at click position
@@ -927,23 +1152,43 @@ class ViewerWidget(QWidget):
         """Handle mouse move event."""
         # Update lens position if lens tool is active and dragging
         if self._lens_active:
+            # The lens view only changes when its position does
             if self._lens_dragging or event.buttons() & Qt.MouseButton.LeftButton:
                 self._update_lens_position(event.pos())
-            self.update()
             return
         
         if self._is_drawing:
             if self._current_tool == "draw":
-                # Add point in page coordinates
-                page_pos = self._screen_to_page_coords(event.pos())
-                self._draw_points.append(page_pos)
+                # Add point in page coordinates, skipping sub-2px jitter
+                stroke_offset = self._stroke_offset
+                if stroke_offset is None:
+                    stroke_offset = self._stroke_offset = self._get_page_offset()
+                pos = event.pos()
+                x = pos.x() - stroke_offset[0]
+                y = pos.y() - stroke_offset[1]
+                last_x, last_y = self._draw_points[self._draw_count - 1]
+                if abs(x - last_x) + abs(y - last_y) < 2:
+                    return
+                self._append_draw_point(x, y)
             elif self._current_tool in ("rectangle", "ellipse", "line", "arrow"):
                 self._draw_end_pos = event.pos()
-            self.update()
+                self._preview_rect = QRect(self._draw_start_pos, self._draw_end_pos).normalized()
+            self._schedule_update()
         elif self._current_tool == "eraser" and event.buttons() & Qt.MouseButton.LeftButton:
             # Continue erasing while dragging
             self._erase_at_position(event.pos())
     
+    def _schedule_update(self) -> None:
+        """Request a repaint, coalescing bursts of mouse events into one."""
+        if not self._update_pending:
+            self._update_pending = True
+            QTimer.singleShot(0, self._flush_update)
+    
+    def _flush_update(self) -> None:
+        """Perform a coalesced repaint request."""
+        self._update_pending = False
+        self.update()
+    
     def mouseReleaseEvent(self, event: QMouseEvent) -> None:
         """Handle mouse release event."""
         if event.button() == Qt.MouseButton.LeftButton:
@@ -954,16 +1199,21 @@ class ViewerWidget(QWidget):
             
             if self._is_drawing:
                 self._is_drawing = False
+                self._stroke_offset = None
                 self._finalize_drawing()
     
     def _update_lens_position(self, mouse_pos: QPoint) -> None:
         """Update the lens view position based on mouse click/drag on the thumbnail."""
-        if self._current_page not in self._page_pixmaps:
+        pixmap = self._page_pixmaps.get(self._current_page)
+        if pixmap is None:
             return
         
-        pixmap = self._page_pixmaps[self._current_page]
+        pixmap_width = pixmap.width()
+        pixmap_height = pixmap.height()
         widget_width = self.width()
         widget_height = self.height()
+        mouse_x = mouse_pos.x()
+        mouse_y = mouse_pos.y()
         
         # Calculate thumbnail bounds (same as in _draw_lens_view)
         left_panel_width = int(widget_width * 0.25)
@@ -971,25 +1221,57 @@ class ViewerWidget(QWidget):
         available_width = left_panel_width - margin * 2
         available_height = widget_height - margin * 2
         
-        scale_w = available_width / pixmap.width()
-        scale_h = available_height / pixmap.height()
+        scale_w = available_width / pixmap_width
+        scale_h = available_height / pixmap_height
         thumb_scale = min(scale_w, scale_h)
         
-        thumb_width = int(pixmap.width() * thumb_scale)
-        thumb_height = int(pixmap.height() * thumb_scale)
+        thumb_width = int(pixmap_width * thumb_scale)
+        thumb_height = int(pixmap_height * thumb_scale)
         thumb_x = margin + (available_width - thumb_width) // 2
         thumb_y = margin + (available_height - thumb_height) // 2
         
         # Check if click is on thumbnail
-        if (thumb_x <= mouse_pos.x() <= thumb_x + thumb_width and
-            thumb_y <= mouse_pos.y() <= thumb_y + thumb_height):
+        if (thumb_x <= mouse_x <= thumb_x + thumb_width and
+            thumb_y <= mouse_y <= thumb_y + thumb_height):
             # Convert click to normalized position (0-1) on page
-            norm_x = (mouse_pos.x() - thumb_x) / thumb_width
-            norm_y = (mouse_pos.y() - thumb_y) / thumb_height
-            self._lens_view_pos = QPointF(
+            norm_x = (mouse_x - thumb_x) / thumb_width
+            norm_y = (mouse_y - thumb_y) / thumb_height
+            view_pos = QPointF(
                 max(0.0, min(1.0, norm_x)),
                 max(0.0, min(1.0, norm_y))
             )
+            if view_pos == self._lens_view_pos:
+                return
+            self._lens_view_pos = view_pos
+            
+            # Repaint only the thumbnail panel and zoomed view, not the whole widget
+            lens_rect = self._lens_rect()
+            self.update(self._last_lens_rect.united(lens_rect))
+            self._last_lens_rect = lens_rect
+    
+    def _lens_rect(self) -> QRect:
+        """Get the widget area that changes when the lens view position moves."""
+        # Same layout as in _draw_lens_view
+        widget_width = self.width()
+        widget_height = self.height()
+        left_panel_width = int(widget_width * 0.20)
+        center_panel_x = left_panel_width + 10
+        center_panel_width = widget_width - center_panel_x - 10
+        
+        # Left panel (thumbnail and view indicator) up to the center panel
+        thumb_rect = QRect(0, 0, center_panel_x, widget_height)
+        
+        # Largest zoomed view, with its white margin and border
+        zoomed_display_width = center_panel_width - 20
+        zoomed_display_height = widget_height - 60
+        zoom_rect = QRect(
+            center_panel_x + (center_panel_width - zoomed_display_width) // 2,
+            (widget_height - zoomed_display_height) // 2,
+            zoomed_display_width,
+            zoomed_display_height,
+        ).adjusted(-3, -3, 3, 3)
+        
+        return thumb_rect.united(zoom_rect)
     
     def _erase_at_position(self, pos: QPoint) -> None:
         """Erase drawing at the given position."""
@@ -997,32 +1279,146 @@ class ViewerWidget(QWidget):
             return
         
         page_pos = self._screen_to_page_coords(pos)
-        eraser_radius = 10
+        eraser_radius = self.ERASER_RADIUS
+        drawings = self._page_drawings[self._current_page]
+        
+        # Only test drawings indexed in the 3x3 cells around the position
+        index = self._get_erase_index(self._current_page)
+        cell_x = page_pos.x() // self.ERASE_CELL_SIZE
+        cell_y = page_pos.y() // self.ERASE_CELL_SIZE
+        candidates: Set[int] = set()
+        for cx in range(cell_x - 1, cell_x + 2):
+            for cy in range(cell_y - 1, cell_y + 2):
+                candidates.update(index.get((cx, cy), ()))
+        
+        # Find drawings near the click position; freehand strokes are batched
+        # through the stroke kernel, other shapes use the per-shape test
+        drawings_to_remove: Set[int] = set()
+        freehand: List[int] = []
+        for i in candidates:
+            drawing = drawings[i]
+            if drawing.get("tool") == "draw":
+                freehand.append(i)
+            elif self._is_point_near_drawing(page_pos, drawing, eraser_radius):
+                drawings_to_remove.add(i)
+        
+        if freehand:
+            points, starts, ends = self._get_stroke_buffer(self._current_page)
+            freehand_indices = np.array(freehand, dtype=np.intp)
+            hits = strokes_hit(
+                points,
+                starts[freehand_indices],
+                ends[freehand_indices],
+                page_pos.x(),
+                page_pos.y(),
+                eraser_radius * eraser_radius,
+            )
+            drawings_to_remove.update(freehand_indices[hits].tolist())
         
-        # Find and remove drawings near the click position
-        drawings_to_remove = []
-        for i, drawing in enumerate(self._page_drawings[self._current_page]):
-            if self._is_point_near_drawing(page_pos, drawing, eraser_radius):
-                drawings_to_remove.append(i)
+        if not drawings_to_remove:
+            return
         
-        # Remove in reverse order to maintain indices
-        for i in reversed(drawings_to_remove):
-            self._page_drawings[self._current_page].pop(i)
-            self._has_changes = True
+        # Rebuild the list once rather than popping each index
+        self._page_drawings[self._current_page] = [
+            d for i, d in enumerate(drawings) if i not in drawings_to_remove
+        ]
+        self._has_changes = True
         
-        if drawings_to_remove:
-            self.update()
+        # Indices shifted - rebuild the page index and stroke buffer on the next erase
+        self._erase_index.pop(self._current_page, None)
+        self._stroke_buffers.pop(self._current_page, None)
+        self._invalidate_drawing_cache(self._current_page)
+        self.update()
+    
+    def _get_erase_index(self, page: int) -> Dict[Tuple[int, int], List[int]]:
+        """Get the eraser grid index for a page, building it if needed."""
+        index = self._erase_index.get(page)
+        if index is None:
+            index = {}
+            self._erase_index[page] = index
+            for i, drawing in enumerate(self._page_drawings.get(page, [])):
+                self._index_drawing(page, i, drawing)
+        return index
+    
+    def _get_stroke_buffer(self, page: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the page's packed freehand points and per-drawing [start, end) ranges."""
+        buffer = self._stroke_buffers.get(page)
+        if buffer is None:
+            drawings = self._page_drawings.get(page, [])
+            strokes = [
+                drawing["points"] if drawing.get("tool") == "draw" else None
+                for drawing in drawings
+            ]
+            lengths = np.array(
+                [len(stroke) if stroke is not None else 0 for stroke in strokes],
+                dtype=np.intp,
+            )
+            ends = np.cumsum(lengths)
+            starts = ends - lengths
+            packed = [stroke for stroke in strokes if stroke is not None]
+            points = (
+                np.concatenate(packed) if packed else np.zeros((0, 2), dtype=np.int32)
+            )
+            buffer = (points, starts, ends)
+            self._stroke_buffers[page] = buffer
+        return buffer
+    
+    def _index_drawing(self, page: int, drawing_index: int, drawing: dict) -> None:
+        """Add a drawing to the page's eraser grid index, if it has been built."""
+        index = self._erase_index.get(page)
+        if index is None:
+            return
+        
+        for cell in self._drawing_cells(drawing):
+            index.setdefault(cell, []).append(drawing_index)
+    
+    def _drawing_cells(self, drawing: dict) -> Set[Tuple[int, int]]:
+        """Get the eraser grid cells covered by a drawing."""
+        size = self.ERASE_CELL_SIZE
+        tool = drawing.get("tool")
+        
+        if tool == "draw":
+            points = drawing.get("points")
+            if points is None:
+                return set()
+            
+            # Cover each segment's cell range so simplified strokes stay erasable
+            cells = (points // size).tolist()
+            covered = set(map(tuple, cells))
+            for (ax, ay), (bx, by) in zip(cells, cells[1:]):
+                if ax != bx or ay != by:
+                    covered.update(
+                        (cx, cy)
+                        for cx in range(min(ax, bx), max(ax, bx) + 1)
+                        for cy in range(min(ay, by), max(ay, by) + 1)
+                    )
+            return covered
+        
+        rect = drawing.get("bbox")
+        if rect is None:
+            return set()
+        
+        return {
+            (cx, cy)
+            for cx in range(rect.left() // size, rect.right() // size + 1)
+            for cy in range(rect.top() // size, rect.bottom() // size + 1)
+        }
     
     def _is_point_near_drawing(self, point: QPoint, drawing: dict, radius: int) -> bool:
         """Check if a point is near a drawing."""
+        # Fast reject against the cached bounding box
+        bbox = drawing.get("bbox")
+        if bbox is not None and not bbox.adjusted(-radius, -radius, radius, radius).contains(point):
+            return False
+        
         tool = drawing.get("tool")
         
         if tool == "draw":
             # Check if point is near any segment of the freehand drawing
-            points = drawing.get("points", [])
-            for p in points:
-                if abs(p.x() - point.x()) < radius and abs(p.y() - point.y()) < radius:
-                    return True
+            points = drawing.get("points")
+            if points is not None:
+                distances = _polyline_distance_sq(points, point.x(), point.y())
+                return bool(np.any(distances < radius * radius))
         
         elif tool in ("rectangle", "ellipse"):
             rect = drawing.get("rect")
@@ -1036,52 +1432,43 @@ class ViewerWidget(QWidget):
             end = drawing.get("end")
             if start and end:
                 # Check distance from point to line segment
-                return self._point_to_line_distance(point, start, end) < radius
+                return self._point_to_line_distance_sq(point, start, end) < radius * radius
         
         return False
     
-    def _point_to_line_distance(self, point: QPoint, line_start: QPoint, line_end: QPoint) -> float:
-        """Calculate distance from point to line segment."""
-        import math
-        
-        dx = line_end.x() - line_start.x()
-        dy = line_end.y() - line_start.y()
-        
-        if dx == 0 and dy == 0:
-            return math.sqrt((point.x() - line_start.x())**2 + (point.y() - line_start.y())**2)
-        
-        t = max(0, min(1, ((point.x() - line_start.x()) * dx + (point.y() - line_start.y()) * dy) / (dx * dx + dy * dy)))
-        
-        proj_x = line_start.x() + t * dx
-        proj_y = line_start.y() + t * dy
-        
-        return math.sqrt((point.x() - proj_x)**2 + (point.y() - proj_y)**2)
+    def _point_to_line_distance_sq(self, point: QPoint, line_start: QPoint, line_end: QPoint) -> float:
+        """Calculate squared distance from point to line segment."""
+        return _segment_distance_sq(
+            point.x(), point.y(),
+            line_start.x(), line_start.y(),
+            line_end.x(), line_end.y(),
+        )
     
     def wheelEvent(self, event: QWheelEvent) -> None:
         """Handle mouse wheel event."""
         modifiers = event.modifiers()
+        delta = event.angleDelta().y()
         
         if modifiers == Qt.KeyboardModifier.ControlModifier:
             # Zoom with Ctrl+Wheel
-            delta = event.angleDelta().y()
             if delta > 0:
                 self.zoom_in()
             else:
                 self.zoom_out()
         else:
             # Page navigation with wheel (single page view)
-            delta = event.angleDelta().y()
+            current_page = self._current_page
+            pixmap = self._page_pixmaps.get(current_page)
             
-            if self._current_page in self._page_pixmaps:
-                pixmap = self._page_pixmaps[self._current_page]
-                
+            if pixmap is not None:
                 # Calculate how much the page exceeds the view
                 extra_height = pixmap.height() - self.height() + 40
                 
                 if extra_height > 0:
                     # Page is taller than view - allow scrolling within page
                     scroll_amount = 60
-                    new_y = self._scroll_offset.y()
+                    scroll_offset = self._scroll_offset
+                    new_y = scroll_offset.y()
                     
                     if delta > 0:  # Scroll up
                         new_y -= scroll_amount
@@ -1094,28 +1481,29 @@ class ViewerWidget(QWidget):
                     
                     # Check if at boundary - change page
                     if new_y < min_scroll - 30:
-                        if self._current_page > 0:
+                        if current_page > 0:
                             self.go_to_previous_page()
                             # Position at bottom of previous page
                             QTimer.singleShot(50, self._scroll_to_bottom)
                         return
                     elif new_y > max_scroll + 30:
-                        if self._current_page < self._page_count - 1:
+                        if current_page < self._page_count - 1:
                             self.go_to_next_page()
                             # Position at top (already reset by go_to_page)
                         return
                     
                     # Clamp to bounds
                     new_y = max(min_scroll, min(new_y, max_scroll))
-                    self._scroll_offset.setY(new_y)
+                    scroll_offset.setY(new_y)
+                    self._stroke_offset = None
                     self.update()
                 else:
                     # Page fits in view - just change pages
                     if delta > 0:
-                        if self._current_page > 0:
+                        if current_page > 0:
                             self.go_to_previous_page()
                     else:
-                        if self._current_page < self._page_count - 1:
+                        if current_page < self._page_count - 1:
                             self.go_to_next_page()
     
     def _scroll_to_bottom(self) -> None:
@@ -1153,6 +1541,8 @@ class ViewerWidget(QWidget):
     def resizeEvent(self, event: QResizeEvent) -> None:
         """Handle resize event."""
         super().resizeEvent(event)
+        self._offset_cache = (None, None)
+        self._stroke_offset = None
         self.update()
     
     def _check_annotation_selection(self, pos: QPoint) -> None:
@@ -1169,19 +1559,25 @@ class ViewerWidget(QWidget):
         offset_x, offset_y = self._get_page_offset()
         
         if self._current_tool == "draw":
-            if len(self._draw_points) < 2:
-                self._draw_points.clear()
+            if self._draw_count < 2:
+                self._draw_count = 0
                 return
             
+            points = self._simplify_stroke(self._draw_points[:self._draw_count])
+            min_x, min_y = points.min(axis=0)
+            max_x, max_y = points.max(axis=0)
+            
             # Save freehand drawing (already in page coordinates)
             drawing = {
                 "tool": "draw",
-                "points": list(self._draw_points),  # Copy the list
+                "points": points,
+                "bbox": QRect(QPoint(int(min_x), int(min_y)), QPoint(int(max_x), int(max_y))),
+                "path": self._build_stroke_path(points),
                 "color": QColor(self._stroke_color),
                 "width": self._stroke_width,
             }
-            self._page_drawings[self._current_page].append(drawing)
-            self._draw_points.clear()
+            self._append_drawing(drawing)
+            self._draw_count = 0
         
         elif self._current_tool in ("rectangle", "ellipse"):
             if self._draw_start_pos and self._draw_end_pos:
@@ -1194,11 +1590,12 @@ class ViewerWidget(QWidget):
                     drawing = {
                         "tool": self._current_tool,
                         "rect": rect,
+                        "bbox": QRect(rect),
                         "color": QColor(self._stroke_color),
                         "fill_color": QColor(self._fill_color),
                         "width": self._stroke_width,
                     }
-                    self._page_drawings[self._current_page].append(drawing)
+                    self._append_drawing(drawing)
         
         elif self._current_tool in ("line", "arrow"):
             if self._draw_start_pos and self._draw_end_pos:
@@ -1206,18 +1603,21 @@ class ViewerWidget(QWidget):
                 start_page = self._screen_to_page_coords(self._draw_start_pos)
                 end_page = self._screen_to_page_coords(self._draw_end_pos)
                 
-                # Only save if line has some length
-                import math
-                length = math.sqrt((end_page.x() - start_page.x())**2 + (end_page.y() - start_page.y())**2)
-                if length > 5:
+                # Only save if line has some length (squared compare, no sqrt)
+                dx = end_page.x() - start_page.x()
+                dy = end_page.y() - start_page.y()
+                if dx * dx + dy * dy > 25:
                     drawing = {
                         "tool": self._current_tool,
                         "start": start_page,
                         "end": end_page,
+                        "bbox": QRect(start_page, end_page).normalized(),
                         "color": QColor(self._stroke_color),
                         "width": self._stroke_width,
                     }
-                    self._page_drawings[self._current_page].append(drawing)
+                    if self._current_tool == "arrow":
+                        drawing["head"] = self._compute_arrowhead(start_page, end_page)
+                    self._append_drawing(drawing)
         
         # Reset drawing state
         self._draw_start_pos = None
@@ -1225,10 +1625,61 @@ class ViewerWidget(QWidget):
         self._has_changes = True
         self.update()
     
+    def _append_drawing(self, drawing: dict) -> None:
+        """Append a finished drawing to the current page."""
+        drawing["style"] = self._drawing_style(drawing)
+        drawings = self._page_drawings[self._current_page]
+        drawings.append(drawing)
+        self._index_drawing(self._current_page, len(drawings) - 1, drawing)
+        self._stroke_buffers.pop(self._current_page, None)
+        self._invalidate_drawing_cache(self._current_page)
+    
+    def _append_draw_point(self, x: int, y: int) -> None:
+        """Append a point to the in-progress stroke, doubling the buffer when full."""
+        if self._draw_count == len(self._draw_points):
+            grown = np.zeros((len(self._draw_points) * 2, 2), dtype=np.int32)
+            grown[:self._draw_count] = self._draw_points
+            self._draw_points = grown
+        
+        self._draw_points[self._draw_count] = (x, y)
+        self._draw_count += 1
+    
+    def _simplify_stroke(self, points: np.ndarray, tolerance: float = 0.5) -> np.ndarray:
+        """Drop points lying within tolerance of the segment joining their neighbours."""
+        coords = points.tolist()
+        if len(coords) < 3:
+            return points.copy()
+        
+        tolerance_sq = tolerance * tolerance
+        kept = [coords[0]]
+        for i in range(1, len(coords) - 1):
+            ax, ay = kept[-1]
+            px, py = coords[i]
+            bx, by = coords[i + 1]
+            if _segment_distance_sq(px, py, ax, ay, bx, by) >= tolerance_sq:
+                kept.append(coords[i])
+        kept.append(coords[-1])
+        
+        return np.array(kept, dtype=np.int32)
+    
+    def _points_to_polygon(self, points: np.ndarray) -> QPolygon:
+        """Build a QPolygon from an (N, 2) point array."""
+        polygon = QPolygon()
+        if len(points):
+            polygon.setPoints(*points.ravel().tolist())
+        return polygon
+    
+    def _build_stroke_path(self, points: np.ndarray) -> QPainterPath:
+        """Build a painter path through the given freehand points."""
+        path = QPainterPath()
+        path.addPolygon(self._points_to_polygon(points).toPolygonF())
+        return path
+    
     def _cancel_current_action(self) -> None:
         """Cancel the current action."""
         self._is_drawing = False
-        self._draw_points.clear()
+        self._draw_count = 0
+        self._stroke_offset = None
         self._draw_start_pos = None
         self._draw_end_pos = None
         self._selected_annotation = None
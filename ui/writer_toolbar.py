@@ -6,6 +6,7 @@ text formatting, alignment, lists, and insert options.
 """
 
 from __future__ import annotations
+import sys
 from typing import Optional, List
 
 from PyQt6.QtWidgets import (
@@ -22,8 +23,45 @@ from PyQt6.QtWidgets import (
     QHBoxLayout,
     QFrame,
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QSize
-from PyQt6.QtGui import QFont, QColor, QAction, QIcon, QPixmap, QPainter
+from PyQt6.QtCore import Qt, pyqtSignal, QSize, QSignalBlocker
+from PyQt6.QtGui import QFont, QColor, QAction, QIcon, QPixmap, QPainter, QPixmapCache, QIntValidator, QImage
+
+
+# Forwarded signals all live on the GUI thread, so skip the queuing check
+_DIRECT = Qt.ConnectionType.DirectConnection
+
+# Shared colors; treat as read-only, never call setRgb() on them
+_BORDER_COLOR = QColor(128, 128, 128)
+_BLACK = QColor(0, 0, 0)
+_YELLOW = QColor(255, 255, 0)
+
+# Shortcut and tooltip strings handed to Qt by every toolbar instance
+_SC_BOLD = sys.intern("Ctrl+B")
+_SC_ITALIC = sys.intern("Ctrl+I")
+_SC_UNDERLINE = sys.intern("Ctrl+U")
+_TT_BOLD = sys.intern("Bold (Ctrl+B)")
+_TT_ITALIC = sys.intern("Italic (Ctrl+I)")
+_TT_UNDERLINE = sys.intern("Underline (Ctrl+U)")
+
+# Combo presets shared by every toolbar instance
+_COMMON_FONTS = (
+    "Arial", "Times New Roman", "Calibri", "Cambria", "Georgia",
+    "Verdana", "Tahoma", "Trebuchet MS", "Comic Sans MS",
+    "Courier New", "Consolas", "Lucida Console",
+)
+_COMMON_SIZES = ("8", "9", "10", "11", "12", "14", "16", "18", "20", "24", "28", "32", "36", "48", "72")
+_DEFAULT_FONT_IDX = _COMMON_FONTS.index("Arial")
+_DEFAULT_SIZE_IDX = _COMMON_SIZES.index("11")
+_FONT_INDEX = {name: i for i, name in enumerate(_COMMON_FONTS)}
+_SIZE_INDEX = {size: i for i, size in enumerate(_COMMON_SIZES)}
+
+# Alignment flag -> toolbar key, checked in the original if/elif order
+_ALIGN_MAP = (
+    (int(Qt.AlignmentFlag.AlignLeft), "left"),
+    (int(Qt.AlignmentFlag.AlignHCenter), "center"),
+    (int(Qt.AlignmentFlag.AlignRight), "right"),
+    (int(Qt.AlignmentFlag.AlignJustify), "justify"),
+)
 
 
 class ColorButton(QToolButton):
@@ -31,7 +69,10 @@ class ColorButton(QToolButton):
     
     color_changed = pyqtSignal(QColor)
     
-    def __init__(self, initial_color: QColor = QColor(0, 0, 0), parent: Optional[QWidget] = None):
+    # Gray frame shared by every swatch, built on first use
+    _BORDER_OVERLAY: Optional[QImage] = None
+    
+    def __init__(self, initial_color: QColor = _BLACK, parent: Optional[QWidget] = None):
         super().__init__(parent)
         self._color = initial_color
         self.setFixedSize(28, 28)
@@ -48,17 +89,36 @@ class ColorButton(QToolButton):
         self._update_icon()
     
     def _update_icon(self) -> None:
-        pixmap = QPixmap(20, 20)
-        pixmap.fill(self._color)
-        
-        # Draw border
-        painter = QPainter(pixmap)
-        painter.setPen(QColor(128, 128, 128))
-        painter.drawRect(0, 0, 19, 19)
-        painter.end()
+        # Swatches are shared through the global pixmap cache
+        key = f"cb:{self._color.rgba():08x}:{self.iconSize().width()}"
+        pixmap = QPixmapCache.find(key)
+        if pixmap is None:
+            # Paint on the CPU and convert once
+            image = QImage(20, 20, QImage.Format.Format_ARGB32_Premultiplied)
+            image.fill(self._color)
+            
+            # Draw border
+            painter = QPainter(image)
+            painter.drawImage(0, 0, self._border_overlay())
+            painter.end()
+            pixmap = QPixmap.fromImage(image)
+            QPixmapCache.insert(key, pixmap)
         
         self.setIcon(QIcon(pixmap))
     
+    @classmethod
+    def _border_overlay(cls) -> QImage:
+        """Return the transparent swatch frame, building it once."""
+        if cls._BORDER_OVERLAY is None:
+            overlay = QImage(20, 20, QImage.Format.Format_ARGB32_Premultiplied)
+            overlay.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(overlay)
+            painter.setPen(_BORDER_COLOR)
+            painter.drawRect(0, 0, 19, 19)
+            painter.end()
+            cls._BORDER_OVERLAY = overlay
+        return cls._BORDER_OVERLAY
+    
     def _pick_color(self) -> None:
         color = QColorDialog.getColor(self._color, self, "Select Color")
         if color.isValid():
@@ -128,17 +188,69 @@ class WriterToolBar(QToolBar):
     insert_link_clicked = pyqtSignal()
     insert_hr_clicked = pyqtSignal()
     
+    # Action tables: (attr, label, tooltip, shortcut, checkable, target, theme).
+    # ``target`` names a signal (connected via ``emit``) or is an
+    # ``("align", key)`` pair routed to ``_on_align``; ``theme`` is an optional
+    # freedesktop icon name. ``None`` entries insert a separator.
+    _FORMAT_SPEC = (
+        ("_bold_action", "Bold", _TT_BOLD, _SC_BOLD, True, "bold_toggled",
+         "format-text-bold"),
+        ("_italic_action", "Italic", _TT_ITALIC, _SC_ITALIC, True, "italic_toggled",
+         "format-text-italic"),
+        ("_underline_action", "Underline", _TT_UNDERLINE, _SC_UNDERLINE, True, "underline_toggled",
+         "format-text-underline"),
+        ("_strikethrough_action", "Strikethrough", "Strikethrough", None, True, "strikethrough_toggled",
+         "format-text-strikethrough"),
+        None,
+    )
+    _PARAGRAPH_SPEC = (
+        ("_align_left_action", "Align Left", "Align Left", None, True, ("align", "left"),
+         "format-justify-left"),
+        ("_align_center_action", "Center", "Center", None, True, ("align", "center"),
+         "format-justify-center"),
+        ("_align_right_action", "Align Right", "Align Right", None, True, ("align", "right"),
+         "format-justify-right"),
+        ("_align_justify_action", "Justify", "Justify", None, True, ("align", "justify"),
+         "format-justify-fill"),
+        None,
+        ("_bullet_list_action", "Bullet List", "Bullet List", None, False, "bullet_list_clicked",
+         None),
+        ("_numbered_list_action", "Numbered List", "Numbered List", None, False, "numbered_list_clicked",
+         None),
+        ("_indent_decrease_action", "Decrease Indent", "Decrease Indent", None, False, "indent_decrease_clicked",
+         "format-indent-less"),
+        ("_indent_increase_action", "Increase Indent", "Increase Indent", None, False, "indent_increase_clicked",
+         "format-indent-more"),
+        None,
+    )
+    
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__("Writer", parent)
         self.setObjectName("WriterToolBar")
         
         self.setMovable(False)
         self.setIconSize(QSize(16, 16))
+        # Theme icons are optional and may be missing; labels keep every button readable
+        self.setToolButtonStyle(Qt.ToolButtonStyle.ToolButtonTextOnly)
+        
+        # Last values pushed by update_format_state, keyed by argument name
+        self._last_state: dict = {}
+        self._align_key = "left"
         
         self._setup_ui()
+        
+        # Any user edit on the toolbar makes the cached state stale
+        self.actionTriggered.connect(self._invalidate_state)
+        self._font_combo.currentTextChanged.connect(self._invalidate_state)
+        self._size_combo.currentTextChanged.connect(self._invalidate_state)
+        self._text_color_btn.color_changed.connect(self._invalidate_state)
+        self._highlight_btn.color_changed.connect(self._invalidate_state)
     
     def _setup_ui(self) -> None:
         """Set up toolbar UI."""
+        # Coalesce the relayouts from each add* call into one pass at the end
+        self.setUpdatesEnabled(False)
+        self.blockSignals(True)
         
         # =====================================================================
         # Font Family
@@ -147,15 +259,9 @@ class WriterToolBar(QToolBar):
         self._font_combo.setMinimumWidth(150)
         self._font_combo.setEditable(True)
         
-        # Common fonts
-        fonts = [
-            "Arial", "Times New Roman", "Calibri", "Cambria", "Georgia",
-            "Verdana", "Tahoma", "Trebuchet MS", "Comic Sans MS",
-            "Courier New", "Consolas", "Lucida Console",
-        ]
-        self._font_combo.addItems(fonts)
-        self._font_combo.setCurrentText("Arial")
-        self._font_combo.currentTextChanged.connect(self.font_family_changed.emit)
+        self._font_combo.addItems(_COMMON_FONTS)
+        self._font_combo.setCurrentIndex(_DEFAULT_FONT_IDX)
+        self._font_combo.currentTextChanged.connect(self.font_family_changed.emit, _DIRECT)
         self.addWidget(self._font_combo)
         
         # =====================================================================
@@ -164,10 +270,10 @@ class WriterToolBar(QToolBar):
         self._size_combo = QComboBox()
         self._size_combo.setMinimumWidth(60)
         self._size_combo.setEditable(True)
+        self._size_combo.lineEdit().setValidator(QIntValidator(1, 200, self))
         
-        sizes = ["8", "9", "10", "11", "12", "14", "16", "18", "20", "24", "28", "32", "36", "48", "72"]
-        self._size_combo.addItems(sizes)
-        self._size_combo.setCurrentText("11")
+        self._size_combo.addItems(_COMMON_SIZES)
+        self._size_combo.setCurrentIndex(_DEFAULT_SIZE_IDX)
         self._size_combo.currentTextChanged.connect(self._on_size_changed)
         self.addWidget(self._size_combo)
         
@@ -176,104 +282,28 @@ class WriterToolBar(QToolBar):
         # =====================================================================
         # Text Formatting
         # =====================================================================
-        self._bold_action = QAction("Bold", self)
-        self._bold_action.setCheckable(True)
-        self._bold_action.setShortcut("Ctrl+B")
-        self._bold_action.setToolTip("Bold (Ctrl+B)")
-        self._bold_action.triggered.connect(self.bold_toggled.emit)
-        self.addAction(self._bold_action)
-        
-        self._italic_action = QAction("Italic", self)
-        self._italic_action.setCheckable(True)
-        self._italic_action.setShortcut("Ctrl+I")
-        self._italic_action.setToolTip("Italic (Ctrl+I)")
-        self._italic_action.triggered.connect(self.italic_toggled.emit)
-        self.addAction(self._italic_action)
-        
-        self._underline_action = QAction("Underline", self)
-        self._underline_action.setCheckable(True)
-        self._underline_action.setShortcut("Ctrl+U")
-        self._underline_action.setToolTip("Underline (Ctrl+U)")
-        self._underline_action.triggered.connect(self.underline_toggled.emit)
-        self.addAction(self._underline_action)
-        
-        self._strikethrough_action = QAction("Strikethrough", self)
-        self._strikethrough_action.setCheckable(True)
-        self._strikethrough_action.setToolTip("Strikethrough")
-        self._strikethrough_action.triggered.connect(self.strikethrough_toggled.emit)
-        self.addAction(self._strikethrough_action)
-        
-        self.addSeparator()
+        self._add_actions(self._FORMAT_SPEC)
         
         # =====================================================================
         # Colors
         # =====================================================================
-        self._text_color_btn = ColorButton(QColor(0, 0, 0))
+        self._text_color_btn = ColorButton(_BLACK)
         self._text_color_btn.setToolTip("Text Color")
-        self._text_color_btn.color_changed.connect(self.text_color_changed.emit)
+        self._text_color_btn.color_changed.connect(self.text_color_changed.emit, _DIRECT)
         self.addWidget(self._text_color_btn)
         
-        self._highlight_btn = ColorButton(QColor(255, 255, 0))
+        self._highlight_btn = ColorButton(_YELLOW)
         self._highlight_btn.setToolTip("Highlight Color")
-        self._highlight_btn.color_changed.connect(self.highlight_color_changed.emit)
+        self._highlight_btn.color_changed.connect(self.highlight_color_changed.emit, _DIRECT)
         self.addWidget(self._highlight_btn)
         
         self.addSeparator()
         
         # =====================================================================
-        # Alignment
+        # Alignment and Lists
         # =====================================================================
-        self._align_left_action = QAction("Align Left", self)
-        self._align_left_action.setCheckable(True)
+        self._add_actions(self._PARAGRAPH_SPEC)
         self._align_left_action.setChecked(True)
-        self._align_left_action.setToolTip("Align Left")
-        self._align_left_action.triggered.connect(self._on_align_left)
-        self.addAction(self._align_left_action)
-        
-        self._align_center_action = QAction("Center", self)
-        self._align_center_action.setCheckable(True)
-        self._align_center_action.setToolTip("Center")
-        self._align_center_action.triggered.connect(self._on_align_center)
-        self.addAction(self._align_center_action)
-        
-        self._align_right_action = QAction("Align Right", self)
-        self._align_right_action.setCheckable(True)
-        self._align_right_action.setToolTip("Align Right")
-        self._align_right_action.triggered.connect(self._on_align_right)
-        self.addAction(self._align_right_action)
-        
-        self._align_justify_action = QAction("Justify", self)
-        self._align_justify_action.setCheckable(True)
-        self._align_justify_action.setToolTip("Justify")
-        self._align_justify_action.triggered.connect(self._on_align_justify)
-        self.addAction(self._align_justify_action)
-        
-        self.addSeparator()
-        
-        # =====================================================================
-        # Lists
-        # =====================================================================
-        self._bullet_list_action = QAction("Bullet List", self)
-        self._bullet_list_action.setToolTip("Bullet List")
-        self._bullet_list_action.triggered.connect(self.bullet_list_clicked.emit)
-        self.addAction(self._bullet_list_action)
-        
-        self._numbered_list_action = QAction("Numbered List", self)
-        self._numbered_list_action.setToolTip("Numbered List")
-        self._numbered_list_action.triggered.connect(self.numbered_list_clicked.emit)
-        self.addAction(self._numbered_list_action)
-        
-        self._indent_decrease_action = QAction("Decrease Indent", self)
-        self._indent_decrease_action.setToolTip("Decrease Indent")
-        self._indent_decrease_action.triggered.connect(self.indent_decrease_clicked.emit)
-        self.addAction(self._indent_decrease_action)
-        
-        self._indent_increase_action = QAction("Increase Indent", self)
-        self._indent_increase_action.setToolTip("Increase Indent")
-        self._indent_increase_action.triggered.connect(self.indent_increase_clicked.emit)
-        self.addAction(self._indent_increase_action)
-        
-        self.addSeparator()
         
         # =====================================================================
         # Insert Menu
@@ -282,58 +312,81 @@ class WriterToolBar(QToolBar):
         self._insert_button.setText("Insert")
         self._insert_button.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
         
+        # Populated on first popup; most sessions never open it
         insert_menu = QMenu(self._insert_button)
+        self._insert_menu_built = False
+        insert_menu.aboutToShow.connect(self._build_insert_menu)
+        
+        self._insert_button.setMenu(insert_menu)
+        self.addWidget(self._insert_button)
+        
+        self.blockSignals(False)
+        self.setUpdatesEnabled(True)
+        self.updateGeometry()
+    
+    def _add_actions(self, spec: tuple) -> None:
+        """Create toolbar actions from a declarative spec table."""
+        for entry in spec:
+            if entry is None:
+                self.addSeparator()
+                continue
+            attr, label, tooltip, shortcut, checkable, target, theme = entry
+            action = QAction(label, self)
+            if theme:
+                # Shown in the overflow menu; the toolbar itself stays text-only
+                action.setIcon(QIcon.fromTheme(theme))
+            action.setCheckable(checkable)
+            if shortcut:
+                action.setShortcut(shortcut)
+            action.setToolTip(tooltip)
+            if isinstance(target, tuple):
+                key = target[1]
+                action.triggered.connect(lambda _=False, k=key: self._on_align(k), _DIRECT)
+            else:
+                action.triggered.connect(getattr(self, target).emit, _DIRECT)
+            setattr(self, attr, action)
+            self.addAction(action)
+    
+    def _build_insert_menu(self) -> None:
+        """Populate the Insert menu the first time it is shown."""
+        if self._insert_menu_built:
+            return
+        self._insert_menu_built = True
+        insert_menu = self._insert_button.menu()
         
         insert_image_action = insert_menu.addAction("Image...")
-        insert_image_action.triggered.connect(self.insert_image_clicked.emit)
+        insert_image_action.triggered.connect(self.insert_image_clicked.emit, _DIRECT)
         
         insert_table_action = insert_menu.addAction("Table...")
-        insert_table_action.triggered.connect(self.insert_table_clicked.emit)
+        insert_table_action.triggered.connect(self.insert_table_clicked.emit, _DIRECT)
         
         insert_menu.addSeparator()
         
         insert_equation_action = insert_menu.addAction("Equation (LaTeX)...")
-        insert_equation_action.triggered.connect(self.insert_equation_clicked.emit)
+        insert_equation_action.triggered.connect(self.insert_equation_clicked.emit, _DIRECT)
         
         insert_menu.addSeparator()
         
         insert_hr_action = insert_menu.addAction("Horizontal Line")
-        insert_hr_action.triggered.connect(self.insert_hr_clicked.emit)
-        
-        self._insert_button.setMenu(insert_menu)
-        self.addWidget(self._insert_button)
+        insert_hr_action.triggered.connect(self.insert_hr_clicked.emit, _DIRECT)
     
     def _on_size_changed(self, text: str) -> None:
         """Handle font size change."""
-        try:
+        # Intermediate input can be empty or 0; isdigit() alone also accepts
+        # characters such as '²' that int() rejects
+        if text.isascii() and text.isdigit():
             size = int(text)
             if 1 <= size <= 200:
                 self.font_size_changed.emit(size)
-        except ValueError:
-            pass
-    
-    def _on_align_left(self) -> None:
-        """Handle left align."""
-        self._update_alignment_buttons("left")
-        self.align_left_clicked.emit()
-    
-    def _on_align_center(self) -> None:
-        """Handle center align."""
-        self._update_alignment_buttons("center")
-        self.align_center_clicked.emit()
-    
-    def _on_align_right(self) -> None:
-        """Handle right align."""
-        self._update_alignment_buttons("right")
-        self.align_right_clicked.emit()
     
-    def _on_align_justify(self) -> None:
-        """Handle justify."""
-        self._update_alignment_buttons("justify")
-        self.align_justify_clicked.emit()
+    def _on_align(self, key: str) -> None:
+        """Handle an alignment action ("left", "center", "right", "justify")."""
+        self._update_alignment_buttons(key)
+        getattr(self, f"align_{key}_clicked").emit()
     
     def _update_alignment_buttons(self, active: str) -> None:
         """Update alignment button states."""
+        self._align_key = active
         self._align_left_action.setChecked(active == "left")
         self._align_center_action.setChecked(active == "center")
         self._align_right_action.setChecked(active == "right")
@@ -356,44 +409,60 @@ class WriterToolBar(QToolBar):
         alignment: Qt.AlignmentFlag = Qt.AlignmentFlag.AlignLeft,
     ) -> None:
         """Update toolbar state to match current text format."""
-        # Block signals to avoid triggering changes
-        self._font_combo.blockSignals(True)
-        self._size_combo.blockSignals(True)
-        
-        if font_family:
-            self._font_combo.setCurrentText(font_family)
-        if font_size > 0:
-            self._size_combo.setCurrentText(str(font_size))
-        
-        self._font_combo.blockSignals(False)
-        self._size_combo.blockSignals(False)
-        
-        self._bold_action.setChecked(bold)
-        self._italic_action.setChecked(italic)
-        self._underline_action.setChecked(underline)
-        self._strikethrough_action.setChecked(strikethrough)
-        
-        if text_color:
+        changed = self._state_changed
+        
+        # Presets are selected by index; only custom values need a text lookup
+        if font_family and changed("font_family", font_family):
+            # Block signals to avoid triggering changes
+            with QSignalBlocker(self._font_combo):
+                idx = _FONT_INDEX.get(font_family, -1)
+                if idx >= 0:
+                    self._font_combo.setCurrentIndex(idx)
+                else:
+                    self._font_combo.setCurrentText(font_family)
+        if font_size > 0 and changed("font_size", font_size):
+            with QSignalBlocker(self._size_combo):
+                size_text = str(font_size)
+                idx = _SIZE_INDEX.get(size_text, -1)
+                if idx >= 0:
+                    self._size_combo.setCurrentIndex(idx)
+                else:
+                    self._size_combo.setCurrentText(size_text)
+        
+        if changed("bold", bold):
+            self._bold_action.setChecked(bold)
+        if changed("italic", italic):
+            self._italic_action.setChecked(italic)
+        if changed("underline", underline):
+            self._underline_action.setChecked(underline)
+        if changed("strikethrough", strikethrough):
+            self._strikethrough_action.setChecked(strikethrough)
+        
+        if text_color and changed("text_color", text_color):
             self._text_color_btn.color = text_color
-        if highlight_color:
+        if highlight_color and changed("highlight_color", highlight_color):
             self._highlight_btn.color = highlight_color
         
         # Update alignment
-        if alignment & Qt.AlignmentFlag.AlignLeft:
-            self._update_alignment_buttons("left")
-        elif alignment & Qt.AlignmentFlag.AlignHCenter:
-            self._update_alignment_buttons("center")
-        elif alignment & Qt.AlignmentFlag.AlignRight:
-            self._update_alignment_buttons("right")
-        elif alignment & Qt.AlignmentFlag.AlignJustify:
-            self._update_alignment_buttons("justify")
+        flags = int(alignment)
+        for flag, key in _ALIGN_MAP:
+            if flags & flag:
+                if key != self._align_key:
+                    self._update_alignment_buttons(key)
+                break
+    
+    def _state_changed(self, key: str, value) -> bool:
+        """Record ``value`` for ``key`` and report whether it differs."""
+        if key in self._last_state and self._last_state[key] == value:
+            return False
+        self._last_state[key] = value
+        return True
+    
+    def _invalidate_state(self, *args) -> None:
+        """Forget cached format state after a user edit."""
+        self._last_state.clear()
     
     def set_enabled(self, enabled: bool) -> None:
         """Enable or disable all toolbar controls."""
-        for action in self.actions():
-            action.setEnabled(enabled)
-        self._font_combo.setEnabled(enabled)
-        self._size_combo.setEnabled(enabled)
-        self._text_color_btn.setEnabled(enabled)
-        self._highlight_btn.setEnabled(enabled)
-        self._insert_button.setEnabled(enabled)
+        # Child widgets and action buttons follow the toolbar's enabled state
+        super().setEnabled(enabled)
@@ -6,10 +6,19 @@ formatting, images, tables, and LaTeX equations.
 """
 
 from __future__ import annotations
+from io import IncrementalNewlineDecoder
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 import json
 import base64
+import codecs
+import hashlib
+import itertools
+import mmap
+import os
+import re
+import shutil
+import tempfile
 
 from PyQt6.QtWidgets import (
     QWidget,
@@ -25,20 +34,39 @@ from PyQt6.QtWidgets import (
     QInputDialog,
     QColorDialog,
     QFontDialog,
+    QProgressDialog,
+)
+from PyQt6.QtCore import (
+    Qt,
+    QPoint,
+    QSize,
+    pyqtSignal,
+    QTimer,
+    QMarginsF,
+    QUrl,
+    QBuffer,
+    QByteArray,
+    QDataStream,
+    QIODevice,
+    QThread,
+    QCoreApplication,
 )
-from PyQt6.QtCore import Qt, QPoint, QSize, pyqtSignal, QTimer, QMarginsF
 from PyQt6.QtGui import (
     QFont,
     QColor,
     QTextCursor,
     QTextCharFormat,
     QTextBlockFormat,
+    QTextFormat,
+    QTextList,
     QTextListFormat,
     QTextTableFormat,
     QTextFrameFormat,
     QTextImageFormat,
     QTextDocument,
     QImage,
+    QImageReader,
+    QPixmap,
     QKeySequence,
     QAction,
     QPainter,
@@ -47,6 +75,291 @@ from PyQt6.QtGui import (
 )
 from PyQt6.QtPrintSupport import QPrinter
 
+from ui.dialogs.equation_dialog import render_latex_png
+
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to the stdlib encoder
+    orjson = None
+
+
+# src="data:image/...;base64,..." attributes embedded in saved HTML
+_DATA_IMAGE_RE = re.compile(r'src=(["\'])(data:image/[^;,"\']*;base64,[^"\']*)\1')
+_LAZY_IMAGE_RE = re.compile(r'src="(npp-img:\d+)"')
+
+# Placeholder ids are unique across documents, so a leaked name never
+# resolves to another document's image
+_LAZY_IMAGE_IDS = itertools.count()
+
+# Binary .npp layout: magic, layout version, then a QDataStream of the title,
+# the blocks with their format runs, and the images they reference
+_NATIVE_MAGIC = b"NPPDOC"
+_NATIVE_VERSION = 2
+_NATIVE_STREAM_VERSION = QDataStream.Version.Qt_6_5
+
+
+def _placeholder_name() -> str:
+    """Fresh URL for an image whose data the document loads lazily."""
+    return f"npp-img:{next(_LAZY_IMAGE_IDS)}"
+
+
+def _toggle_formats(setter: str, on: Any, off: Any) -> Dict[bool, QTextCharFormat]:
+    """Char formats for both states of a formatting toggle, built once."""
+    formats = {}
+    for state, value in ((True, on), (False, off)):
+        fmt = QTextCharFormat()
+        getattr(fmt, setter)(value)
+        formats[state] = fmt
+    return formats
+
+
+class _LazyResourceDocument(QTextDocument):
+    """Text document that decodes embedded base64 images on first use."""
+    
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self._embedded: Dict[str, str] = {}
+    
+    def embed_image(self, data_uri: str, name: Optional[str] = None) -> str:
+        """Register a data URI and return the placeholder name it loads from."""
+        name = name or _placeholder_name()
+        self._embedded[name] = data_uri
+        return name
+    
+    def embedded_image(self, name: str) -> Optional[str]:
+        """Data URI behind a placeholder name, if it is one of ours."""
+        return self._embedded.get(name)
+    
+    def strip_embedded_images(self, html: str) -> str:
+        """Swap inline data URIs for placeholder URLs resolved on demand."""
+        return _DATA_IMAGE_RE.sub(
+            lambda m: f'src="{self.embed_image(m.group(2))}"', html
+        )
+    
+    def restore_embedded_images(self, html: str) -> str:
+        """Put the original data URIs back into serialized HTML."""
+        if not self._embedded:
+            return html
+        embedded = self._embedded
+        return _LAZY_IMAGE_RE.sub(
+            lambda m: f'src="{embedded.get(m.group(1), m.group(1))}"', html
+        )
+    
+    def embedded_urls(self) -> List[QUrl]:
+        """Placeholder URLs of the images stripped out at load time."""
+        return [QUrl(name) for name in self._embedded]
+    
+    def loadResource(self, resource_type: int, url: QUrl) -> Any:
+        data_uri = self._embedded.get(url.toString())
+        if data_uri is None:
+            return super().loadResource(resource_type, url)
+        # Qt caches the returned image, so each payload is decoded once
+        image = QImage()
+        image.loadFromData(base64.b64decode(data_uri.partition(",")[2]))
+        return image
+
+
+class _DocumentEditor(QTextEdit):
+    """Text edit that keeps lazily loaded images embedded in copied HTML."""
+    
+    def createMimeDataFromSelection(self) -> Any:
+        mime = super().createMimeDataFromSelection()
+        document = self.document()
+        if isinstance(document, _LazyResourceDocument) and mime.hasHtml():
+            # Placeholders only resolve inside their own document
+            mime.setHtml(document.restore_embedded_images(mime.html()))
+        return mime
+
+
+def _image_data_uri(document: QTextDocument, name: str) -> Optional[str]:
+    """Inline data URI for an image resource the document refers to."""
+    if name.startswith("data:"):
+        return name
+    if isinstance(document, _LazyResourceDocument):
+        data_uri = document.embedded_image(name)
+        if data_uri is not None:
+            return data_uri
+    
+    resource = document.resource(QTextDocument.ResourceType.ImageResource.value, QUrl(name))
+    if isinstance(resource, QPixmap):
+        resource = resource.toImage()
+    elif isinstance(resource, QByteArray):
+        resource = QImage.fromData(resource)
+    if not isinstance(resource, QImage) or resource.isNull():
+        return None
+    
+    buffer = QBuffer()
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    resource.save(buffer, "PNG")
+    return "data:image/png;base64," + base64.b64encode(bytes(buffer.data())).decode("ascii")
+
+
+def _encode_native_document(document: QTextDocument, title: str) -> Optional[bytes]:
+    """
+    Serialize a document's blocks and format runs with QDataStream.
+    
+    Returns None for documents with tables or other frames, which this
+    layout does not describe.
+    """
+    # The HTML importer can leave empty frames behind images; those hold
+    # no content and are safe to drop
+    for frame in document.rootFrame().childFrames():
+        if frame.firstPosition() <= frame.lastPosition():
+            return None
+    
+    payload = QByteArray()
+    stream = QDataStream(payload, QIODevice.OpenModeFlag.WriteOnly)
+    stream.setVersion(_NATIVE_STREAM_VERSION)
+    stream.writeRawData(_NATIVE_MAGIC)
+    stream.writeInt32(_NATIVE_VERSION)
+    stream.writeQString(title)
+    stream.writeInt32(document.blockCount())
+    
+    lists: Dict[int, int] = {}
+    images: Dict[str, None] = {}
+    block = document.begin()
+    while block.isValid():
+        block_format = QTextBlockFormat(block.blockFormat())
+        # Object indices belong to this document; list membership is
+        # written separately and rebuilt on load
+        block_format.setObjectIndex(-1)
+        stream << block_format << block.charFormat()
+        
+        text_list = block.textList()
+        if text_list is None:
+            stream.writeInt32(-1)
+        elif text_list.objectIndex() in lists:
+            stream.writeInt32(lists[text_list.objectIndex()])
+        else:
+            lists[text_list.objectIndex()] = len(lists)
+            stream.writeInt32(len(lists) - 1)
+            stream << text_list.format()
+        
+        fragments = []
+        it = block.begin()
+        while not it.atEnd():
+            fragments.append(it.fragment())
+            it += 1
+        stream.writeInt32(len(fragments))
+        for fragment in fragments:
+            char_format = fragment.charFormat()
+            if char_format.isImageFormat():
+                images[char_format.toImageFormat().name()] = None
+            stream << char_format
+            stream.writeQString(fragment.text())
+        block = block.next()
+    
+    embedded = [(name, _image_data_uri(document, name)) for name in images]
+    embedded = [(name, data_uri) for name, data_uri in embedded if data_uri]
+    stream.writeInt32(len(embedded))
+    for name, data_uri in embedded:
+        stream.writeQString(name)
+        stream.writeQString(data_uri)
+    return bytes(payload)
+
+
+def _decode_native_document(data: bytes, document: _LazyResourceDocument) -> str:
+    """Rebuild a document written by ``_encode_native_document``; returns its title."""
+    stream = QDataStream(QByteArray(data))
+    stream.setVersion(_NATIVE_STREAM_VERSION)
+    stream.skipRawData(len(_NATIVE_MAGIC))
+    version = stream.readInt32()
+    if version > _NATIVE_VERSION:
+        raise ValueError(f"Document format {version} is newer than this application")
+    
+    def read_format() -> QTextFormat:
+        text_format = QTextFormat()
+        stream >> text_format
+        return text_format
+    
+    title = stream.readQString()
+    cursor = QTextCursor(document)
+    lists: List[QTextList] = []
+    # Stored image names are replaced by fresh placeholders, so they never
+    # collide with images already loaded in this session
+    renamed: Dict[str, str] = {}
+    
+    for index in range(stream.readInt32()):
+        block_format = read_format().toBlockFormat()
+        block_char_format = read_format().toCharFormat()
+        if index == 0:
+            cursor.setBlockFormat(block_format)
+            cursor.setBlockCharFormat(block_char_format)
+        else:
+            cursor.insertBlock(block_format, block_char_format)
+        
+        list_index = stream.readInt32()
+        if list_index == len(lists):
+            lists.append(cursor.createList(read_format().toListFormat()))
+        elif 0 <= list_index < len(lists):
+            lists[list_index].add(cursor.block())
+        
+        for _ in range(stream.readInt32()):
+            char_format = read_format().toCharFormat()
+            if char_format.isImageFormat():
+                char_format = char_format.toImageFormat()
+                name = char_format.name()
+                if name not in renamed:
+                    renamed[name] = _placeholder_name()
+                char_format.setName(renamed[name])
+            cursor.insertText(stream.readQString(), char_format)
+    
+    for _ in range(stream.readInt32()):
+        name = stream.readQString()
+        data_uri = stream.readQString()
+        if name in renamed:
+            document.embed_image(data_uri, renamed[name])
+    
+    if stream.status() != QDataStream.Status.Ok:
+        raise ValueError("The document file is truncated or corrupt")
+    return title
+
+
+def _file_signature(path: str) -> Optional[tuple]:
+    """(inode, size, mtime) of a file, or None when it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class _PdfExportThread(QThread):
+    """
+    Prints a detached document to a PDF printer off the GUI thread.
+    
+    Qt lays out and paints text on any thread as long as the QTextDocument
+    is used by that thread alone. The clone printed here has no parent and is
+    never shown, so the worker owns it outright; documents attached to the
+    editor (see _load_document) stay on the GUI thread.
+    """
+    
+    failed = pyqtSignal(str)
+    
+    def __init__(self, document: QTextDocument, printer: QPrinter, parent: QWidget):
+        super().__init__(parent)
+        self._document = document
+        self._printer = printer
+        # Layout creates child objects of the document, which must belong
+        # to the thread that does the printing
+        document.moveToThread(self)
+    
+    def run(self) -> None:
+        output = self._printer.outputFileName()
+        try:
+            before = _file_signature(output)
+            self._document.print(self._printer)
+            # print() does not raise when the painter cannot open the output;
+            # a missing or untouched file is the only sign of that
+            after = _file_signature(output)
+            if after is None or after == before:
+                self.failed.emit(f"Could not write {output}")
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            # Hand the document back so it is released on the GUI thread
+            self._document.moveToThread(QCoreApplication.instance().thread())
+
 
 class WriterWidget(QWidget):
     """
@@ -62,6 +375,25 @@ class WriterWidget(QWidget):
     cursor_position_changed = pyqtSignal()
     title_changed = pyqtSignal(str)
     
+    # Plain-text files are streamed into the document in chunks of this size
+    LOAD_CHUNK_SIZE = 1 << 16
+    
+    # Saves reach the disk through a write buffer of this size
+    SAVE_BUFFER_SIZE = 1 << 20
+    
+    # Formatting selections longer than this suspends viewport repaints
+    LARGE_SELECTION = 10_000
+    
+    # Plain block format with no indent; Qt copies formats on assignment
+    _ZERO_BLOCK_FMT = QTextBlockFormat()
+    _ZERO_BLOCK_FMT.setIndent(0)
+    
+    # Toggles merge one of two fixed formats; mergeCharFormat only reads them
+    _BOLD_FMTS = _toggle_formats("setFontWeight", QFont.Weight.Bold, QFont.Weight.Normal)
+    _ITALIC_FMTS = _toggle_formats("setFontItalic", True, False)
+    _UNDERLINE_FMTS = _toggle_formats("setFontUnderline", True, False)
+    _STRIKEOUT_FMTS = _toggle_formats("setFontStrikeOut", True, False)
+    
     def __init__(
         self,
         file_path: Optional[Path] = None,
@@ -74,8 +406,18 @@ class WriterWidget(QWidget):
         self._services = services or {}
         self._document_title = "Untitled Document"
         self._has_changes = False
+        self._tracking_changes = False  # textChanged -> _on_text_changed connected
+        # QTextDocument.revision() at the last load or save
+        self._last_saved_revision = -1
         self._autosave_enabled = True
-        self._autosave_interval = 30000  # 30 seconds
+        self._autosave_delay = 2000  # 2 seconds after the last edit
+        self._autosave_max_interval = 60000  # at least once a minute while editing
+        self._printer: Optional[QPrinter] = None  # Shared by export and print
+        # Last get_current_format result, keyed by the raw format values
+        self._format_cache: Optional[tuple] = None
+        # ((revision, suffix, title), content) of the last serialization;
+        # revisions restart with each document, so it is reset on load
+        self._serialized: Optional[tuple] = None
         
         self._setup_ui()
         self._setup_autosave()
@@ -108,7 +450,7 @@ class WriterWidget(QWidget):
         page_layout.setAlignment(Qt.AlignmentFlag.AlignHCenter)
         
         # The actual text editor (styled like a page)
-        self._editor = QTextEdit()
+        self._editor = _DocumentEditor()
         self._editor.setMinimumWidth(816)  # ~8.5 inches at 96 DPI
         self._editor.setMinimumHeight(1056)  # ~11 inches at 96 DPI
         self._editor.setStyleSheet("""
@@ -135,31 +477,67 @@ class WriterWidget(QWidget):
         layout.addWidget(self._scroll_area)
     
     def _setup_autosave(self) -> None:
-        """Set up autosave timer."""
+        """Set up autosave timers."""
+        # Saves once editing pauses; every edit restarts the countdown
         self._autosave_timer = QTimer(self)
+        self._autosave_timer.setSingleShot(True)
+        self._autosave_timer.setInterval(self._autosave_delay)
         self._autosave_timer.timeout.connect(self._autosave)
-        if self._autosave_enabled:
-            self._autosave_timer.start(self._autosave_interval)
+        
+        # Caps how long continuous typing can go without a checkpoint
+        self._autosave_cap_timer = QTimer(self)
+        self._autosave_cap_timer.setSingleShot(True)
+        self._autosave_cap_timer.setInterval(self._autosave_max_interval)
+        self._autosave_cap_timer.timeout.connect(self._autosave)
+        
+        # Edits restart the idle countdown through QTimer's C++ start slot,
+        # so keystrokes never enter Python; the cap starts with the first
+        # edit after a load or save, in _on_text_changed
+        self._editor.textChanged.connect(self._autosave_timer.start)
     
     def _connect_signals(self) -> None:
         """Connect internal signals."""
-        self._editor.textChanged.connect(self._on_text_changed)
+        self._mark_clean()
         self._editor.cursorPositionChanged.connect(self._on_cursor_changed)
+        
+        # Cursor moves are coalesced to one toolbar update per frame
+        self._cursor_timer = QTimer(self)
+        self._cursor_timer.setSingleShot(True)
+        self._cursor_timer.setInterval(16)
+        self._cursor_timer.timeout.connect(self.cursor_position_changed.emit)
     
     def _on_text_changed(self) -> None:
-        """Handle text changes."""
-        if not self._has_changes:
-            self._has_changes = True
-            self.document_modified.emit(True)
+        """Handle the first text change since the last load or save."""
+        # Only the first edit matters; stop paying for a Python slot on
+        # every keystroke until the document is clean again
+        self._editor.textChanged.disconnect(self._on_text_changed)
+        self._tracking_changes = False
+        self._has_changes = True
+        self._autosave_cap_timer.start()
+        self.document_modified.emit(True)
+    
+    def _mark_clean(self) -> None:
+        """Clear the modified flag and listen for the next edit."""
+        self._has_changes = False
+        if not self._tracking_changes:
+            self._editor.textChanged.connect(self._on_text_changed)
+            self._tracking_changes = True
     
     def _on_cursor_changed(self) -> None:
         """Handle cursor position changes."""
-        self.cursor_position_changed.emit()
+        if not self._cursor_timer.isActive():
+            self._cursor_timer.start()
     
     def _autosave(self) -> None:
         """Auto-save the document if it has changes."""
-        if self._has_changes and self._file_path:
-            self.save_document()
+        self._autosave_timer.stop()
+        self._autosave_cap_timer.stop()
+        if not (self._autosave_enabled and self._has_changes and self._file_path):
+            return
+        # Revisions only advance on real edits, not on cursor or signal noise
+        if self._editor.document().revision() == self._last_saved_revision:
+            return
+        self.save_document()
     
     # =========================================================================
     # Document Operations
@@ -168,9 +546,10 @@ class WriterWidget(QWidget):
     def new_document(self) -> None:
         """Create a new empty document."""
         self._editor.clear()
+        self._serialized = None
         self._file_path = None
         self._document_title = "Untitled Document"
-        self._has_changes = False
+        self._mark_clean()
         self.title_changed.emit(self._document_title)
         self.document_modified.emit(False)
     
@@ -179,28 +558,48 @@ class WriterWidget(QWidget):
         try:
             suffix = file_path.suffix.lower()
             
+            # Build into a detached document without undo history, then swap
+            # it into the editor in one step. It is parented to the editor, so
+            # unlike the PDF export's private clone it is built on this thread
+            document = _LazyResourceDocument(self._editor)
+            document.setDefaultFont(self._editor.font())
+            document.setUndoRedoEnabled(False)
+            
             if suffix == ".npp":
-                # Native format (JSON with embedded content)
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                self._editor.setHtml(data.get("content", ""))
-                self._document_title = data.get("title", file_path.stem)
+                with open(file_path, "rb") as f:
+                    raw = f.read()
+                if raw.startswith(_NATIVE_MAGIC):
+                    # Binary format: blocks and format runs, no HTML parsing
+                    self._document_title = _decode_native_document(raw, document)
+                else:
+                    # JSON with HTML content, written by older versions and
+                    # for documents with tables
+                    data = json.loads(raw)
+                    # Text lays out now; embedded images decode when first painted
+                    document.setHtml(document.strip_embedded_images(data.get("content", "")))
+                    self._document_title = data.get("title", file_path.stem)
             elif suffix == ".html" or suffix == ".htm":
                 with open(file_path, "r", encoding="utf-8") as f:
-                    self._editor.setHtml(f.read())
-                self._document_title = file_path.stem
-            elif suffix == ".txt":
-                with open(file_path, "r", encoding="utf-8") as f:
-                    self._editor.setPlainText(f.read())
+                    document.setHtml(document.strip_embedded_images(f.read()))
                 self._document_title = file_path.stem
             else:
-                # Try to load as plain text
-                with open(file_path, "r", encoding="utf-8") as f:
-                    self._editor.setPlainText(f.read())
+                # .txt, or try to load as plain text
+                self._stream_plain_text(file_path, document)
                 self._document_title = file_path.stem
             
+            document.setUndoRedoEnabled(True)
+            # The editor's built-in document is freed by setDocument; one
+            # from an earlier load is parented to the editor and must go too
+            previous = self._editor.document()
+            owned = previous.parent() is self._editor
+            self._editor.setDocument(document)
+            if owned:
+                previous.deleteLater()
+            
             self._file_path = file_path
-            self._has_changes = False
+            self._serialized = None
+            self._mark_clean()
+            self._last_saved_revision = document.revision()
             self.title_changed.emit(self._document_title)
             return True
             
@@ -212,6 +611,24 @@ class WriterWidget(QWidget):
             )
             return False
     
+    def _stream_plain_text(self, file_path: Path, document: QTextDocument) -> None:
+        """Insert a text file into ``document`` chunk by chunk."""
+        cursor = QTextCursor(document)
+        chunk_size = self.LOAD_CHUNK_SIZE
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size:
+                return  # empty files cannot be mapped
+            # Map the file and decode slice by slice: the OS pages content in
+            # on demand and no buffered copy of the file is ever held
+            decoder = IncrementalNewlineDecoder(
+                codecs.getincrementaldecoder("utf-8")(), translate=True
+            )
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for start in range(0, size, chunk_size):
+                    cursor.insertText(decoder.decode(mapped[start:start + chunk_size]))
+            cursor.insertText(decoder.decode(b"", final=True))
+    
     def save_document(self) -> bool:
         """Save the current document."""
         if not self._file_path:
@@ -220,27 +637,19 @@ class WriterWidget(QWidget):
         try:
             suffix = self._file_path.suffix.lower()
             
-            if suffix == ".npp":
-                # Native format
-                data = {
-                    "title": self._document_title,
-                    "content": self._editor.toHtml(),
-                    "version": "1.0",
-                }
-                with open(self._file_path, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=2)
-            elif suffix == ".html" or suffix == ".htm":
-                with open(self._file_path, "w", encoding="utf-8") as f:
-                    f.write(self._editor.toHtml())
-            elif suffix == ".txt":
-                with open(self._file_path, "w", encoding="utf-8") as f:
-                    f.write(self._editor.toPlainText())
+            # Serialization is the slow part of a save; an unchanged document
+            # reuses the content produced for the previous save
+            key = (self._editor.document().revision(), suffix, self._document_title)
+            if self._serialized is not None and self._serialized[0] == key:
+                content = self._serialized[1]
             else:
-                # Default to HTML
-                with open(self._file_path, "w", encoding="utf-8") as f:
-                    f.write(self._editor.toHtml())
+                content = self._serialize(suffix)
+                self._serialized = (key, content)
+            
+            self._write_atomic(self._file_path, content)
             
-            self._has_changes = False
+            self._mark_clean()
+            self._last_saved_revision = self._editor.document().revision()
             self.document_modified.emit(False)
             return True
             
@@ -252,6 +661,75 @@ class WriterWidget(QWidget):
             )
             return False
     
+    def _serialize(self, suffix: str) -> str | bytes:
+        """File content for the current document in the format of ``suffix``."""
+        if suffix == ".npp":
+            # Native format
+            content = _encode_native_document(
+                self._editor.document(), self._document_title
+            )
+            if content is None:
+                # Tables still round-trip through HTML
+                data = {
+                    "title": self._document_title,
+                    "content": self._document_html(),
+                    "version": "1.0",
+                }
+                content = self._encode_native(data)
+            return content
+        elif suffix == ".txt":
+            return self._editor.toPlainText()
+        # .html, .htm, and HTML by default
+        return self._document_html()
+    
+    @staticmethod
+    def _encode_native(data: Dict[str, Any]) -> bytes:
+        """Serialize a native document compactly; the file is machine-read."""
+        if orjson is not None:
+            return orjson.dumps(data)
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    
+    @classmethod
+    def _write_atomic(cls, file_path: Path, content: str | bytes) -> None:
+        """Write through a temp file so a failed save never truncates the original."""
+        # Replace the symlink target, not the link, and keep its permissions
+        target = file_path.resolve()
+        fd, temp_name = tempfile.mkstemp(
+            prefix=f".{target.name}.", suffix=".tmp", dir=target.parent
+        )
+        temp_path = Path(temp_name)
+        try:
+            # One large buffer turns a multi-megabyte save into a few writes
+            if isinstance(content, bytes):
+                f = open(fd, "wb", buffering=cls.SAVE_BUFFER_SIZE)
+            else:
+                f = open(fd, "w", encoding="utf-8", buffering=cls.SAVE_BUFFER_SIZE)
+            with f:
+                f.write(content)
+                # The data must be on disk before the rename is; otherwise a
+                # crash can leave the renamed file empty
+                f.flush()
+                os.fsync(f.fileno())
+            if target.exists():
+                shutil.copymode(target, temp_path)
+            else:
+                # mkstemp creates 0600; new files get the usual umask mode
+                umask = os.umask(0)
+                os.umask(umask)
+                os.chmod(temp_path, 0o666 & ~umask)
+            os.replace(temp_path, target)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+    
+    def _document_html(self) -> str:
+        """Serialize the document, re-embedding lazily loaded images."""
+        html = self._editor.toHtml()
+        document = self._editor.document()
+        if isinstance(document, _LazyResourceDocument):
+            html = document.restore_embedded_images(html)
+        return html
+    
     def save_document_as(self) -> bool:
         """Save document with a new name."""
         file_path, selected_filter = QFileDialog.getSaveFileName(
@@ -270,7 +748,7 @@ class WriterWidget(QWidget):
         return self.save_document()
     
     def export_to_pdf(self) -> bool:
-        """Export document to PDF."""
+        """Export document to PDF in the background. Returns True once started."""
         file_path, _ = QFileDialog.getSaveFileName(
             self,
             "Export to PDF",
@@ -281,26 +759,52 @@ class WriterWidget(QWidget):
         if not file_path:
             return False
         
+        directory = os.path.dirname(os.path.abspath(file_path))
+        if not os.path.isdir(directory) or not os.access(directory, os.W_OK):
+            QMessageBox.critical(
+                self,
+                "Export Error",
+                f"Failed to export PDF:\nCannot write to {directory}"
+            )
+            return False
+        
         try:
-            printer = QPrinter(QPrinter.PrinterMode.HighResolution)
+            # The export gets its own printer; the shared one stays free for
+            # print_document while the worker runs
+            printer = self._create_printer()
             printer.setOutputFormat(QPrinter.OutputFormat.PdfFormat)
             printer.setOutputFileName(file_path)
             
-            # Set page size to Letter
-            page_layout = QPageLayout(
-                QPageSize(QPageSize.PageSizeId.Letter),
-                QPageLayout.Orientation.Portrait,
-                QMarginsF(72, 72, 72, 72)  # 1 inch margins
-            )
-            printer.setPageLayout(page_layout)
+            # Layout and painting run on a worker over a detached clone; the
+            # window-modal progress dialog keeps the document open meanwhile
+            progress = QProgressDialog("Exporting to PDF...", "", 0, 0, self)
+            progress.setWindowTitle("Export to PDF")
+            progress.setCancelButton(None)
+            progress.setWindowModality(Qt.WindowModality.WindowModal)
+            progress.show()
             
-            self._editor.document().print(printer)
+            errors: List[str] = []
+            thread = _PdfExportThread(self._printable_document(), printer, self)
+            thread.failed.connect(errors.append)
             
-            QMessageBox.information(
-                self,
-                "Export Complete",
-                f"Document exported to:\n{file_path}"
-            )
+            def _on_finished() -> None:
+                progress.close()
+                thread.deleteLater()
+                if errors:
+                    QMessageBox.critical(
+                        self,
+                        "Export Error",
+                        f"Failed to export PDF:\n{errors[0]}"
+                    )
+                else:
+                    QMessageBox.information(
+                        self,
+                        "Export Complete",
+                        f"Document exported to:\n{file_path}"
+                    )
+            
+            thread.finished.connect(_on_finished)
+            thread.start()
             return True
             
         except Exception as e:
@@ -315,6 +819,24 @@ class WriterWidget(QWidget):
         """Print the document."""
         from PyQt6.QtPrintSupport import QPrintDialog
         
+        printer = self._get_printer()
+        # Undo any PDF target left over from an export
+        printer.setOutputFileName("")
+        printer.setOutputFormat(QPrinter.OutputFormat.NativeFormat)
+        
+        dialog = QPrintDialog(printer, self)
+        if dialog.exec() == QPrintDialog.DialogCode.Accepted:
+            self._printable_document().print(printer)
+    
+    def _get_printer(self) -> QPrinter:
+        """Return the widget's printer, setting it up on first use."""
+        if self._printer is None:
+            self._printer = self._create_printer()
+        return self._printer
+    
+    @staticmethod
+    def _create_printer() -> QPrinter:
+        """High-resolution printer with the document page layout."""
         printer = QPrinter(QPrinter.PrinterMode.HighResolution)
         
         # Set page size to Letter
@@ -324,10 +846,18 @@ class WriterWidget(QWidget):
             QMarginsF(72, 72, 72, 72)  # 1 inch margins
         )
         printer.setPageLayout(page_layout)
-        
-        dialog = QPrintDialog(printer, self)
-        if dialog.exec() == QPrintDialog.DialogCode.Accepted:
-            self._editor.document().print(printer)
+        return printer
+    
+    def _printable_document(self) -> QTextDocument:
+        """Detached copy of the document, so printing never relays out the editor."""
+        document = self._editor.document()
+        clone = document.clone()
+        if isinstance(document, _LazyResourceDocument):
+            # The clone is a plain QTextDocument; hand it the decoded images
+            image_type = QTextDocument.ResourceType.ImageResource
+            for url in document.embedded_urls():
+                clone.addResource(image_type, url, document.resource(image_type, url))
+        return clone
     
     # =========================================================================
     # Formatting Methods
@@ -347,33 +877,23 @@ class WriterWidget(QWidget):
     
     def toggle_bold(self) -> None:
         """Toggle bold formatting."""
-        fmt = QTextCharFormat()
-        cursor = self._editor.textCursor()
-        current_weight = cursor.charFormat().fontWeight()
-        new_weight = QFont.Weight.Normal if current_weight == QFont.Weight.Bold else QFont.Weight.Bold
-        fmt.setFontWeight(new_weight)
-        self._merge_format_on_selection(fmt)
+        current_weight = self._editor.textCursor().charFormat().fontWeight()
+        self._merge_format_on_selection(self._BOLD_FMTS[current_weight != QFont.Weight.Bold])
     
     def toggle_italic(self) -> None:
         """Toggle italic formatting."""
-        fmt = QTextCharFormat()
-        cursor = self._editor.textCursor()
-        fmt.setFontItalic(not cursor.charFormat().fontItalic())
-        self._merge_format_on_selection(fmt)
+        current = self._editor.textCursor().charFormat().fontItalic()
+        self._merge_format_on_selection(self._ITALIC_FMTS[not current])
     
     def toggle_underline(self) -> None:
         """Toggle underline formatting."""
-        fmt = QTextCharFormat()
-        cursor = self._editor.textCursor()
-        fmt.setFontUnderline(not cursor.charFormat().fontUnderline())
-        self._merge_format_on_selection(fmt)
+        current = self._editor.textCursor().charFormat().fontUnderline()
+        self._merge_format_on_selection(self._UNDERLINE_FMTS[not current])
     
     def toggle_strikethrough(self) -> None:
         """Toggle strikethrough formatting."""
-        fmt = QTextCharFormat()
-        cursor = self._editor.textCursor()
-        fmt.setFontStrikeOut(not cursor.charFormat().fontStrikeOut())
-        self._merge_format_on_selection(fmt)
+        current = self._editor.textCursor().charFormat().fontStrikeOut()
+        self._merge_format_on_selection(self._STRIKEOUT_FMTS[not current])
     
     def set_text_color(self, color: QColor) -> None:
         """Set text color."""
@@ -393,35 +913,22 @@ class WriterWidget(QWidget):
     
     def toggle_bullet_list(self) -> None:
         """Toggle bullet list."""
-        cursor = self._editor.textCursor()
-        current_list = cursor.currentList()
-        
-        if current_list and current_list.format().style() == QTextListFormat.Style.ListDisc:
-            # Remove list
-            block_fmt = QTextBlockFormat()
-            block_fmt.setIndent(0)
-            cursor.setBlockFormat(block_fmt)
-        else:
-            # Create bullet list
-            list_fmt = QTextListFormat()
-            list_fmt.setStyle(QTextListFormat.Style.ListDisc)
-            cursor.createList(list_fmt)
+        self._toggle_list(QTextListFormat.Style.ListDisc)
     
     def toggle_numbered_list(self) -> None:
         """Toggle numbered list."""
+        self._toggle_list(QTextListFormat.Style.ListDecimal)
+    
+    def _toggle_list(self, style: QTextListFormat.Style) -> None:
+        """Remove the current list if it has ``style``, otherwise create one."""
         cursor = self._editor.textCursor()
         current_list = cursor.currentList()
         
-        if current_list and current_list.format().style() == QTextListFormat.Style.ListDecimal:
+        if current_list and current_list.format().style() == style:
             # Remove list
-            block_fmt = QTextBlockFormat()
-            block_fmt.setIndent(0)
-            cursor.setBlockFormat(block_fmt)
+            cursor.setBlockFormat(self._ZERO_BLOCK_FMT)
         else:
-            # Create numbered list
-            list_fmt = QTextListFormat()
-            list_fmt.setStyle(QTextListFormat.Style.ListDecimal)
-            cursor.createList(list_fmt)
+            cursor.createList(style)
     
     def increase_indent(self) -> None:
         """Increase paragraph indent."""
@@ -443,7 +950,18 @@ class WriterWidget(QWidget):
         cursor = self._editor.textCursor()
         if not cursor.hasSelection():
             cursor.select(QTextCursor.SelectionType.WordUnderCursor)
-        cursor.mergeCharFormat(fmt)
+        
+        # One undo step and one repaint, however many fragments are touched
+        large = cursor.selectionEnd() - cursor.selectionStart() > self.LARGE_SELECTION
+        cursor.beginEditBlock()
+        if large:
+            self._editor.setUpdatesEnabled(False)
+        try:
+            cursor.mergeCharFormat(fmt)
+        finally:
+            cursor.endEditBlock()
+            if large:
+                self._editor.setUpdatesEnabled(True)
         self._editor.mergeCurrentCharFormat(fmt)
     
     # =========================================================================
@@ -462,34 +980,51 @@ class WriterWidget(QWidget):
         if not file_path:
             return
         
-        image = QImage(file_path)
+        # Scale if too large; decode straight to the target size where the
+        # format supports it (e.g. JPEG DCT scaling) instead of full resolution
+        max_width = 600
+        reader = QImageReader(file_path)
+        source_size = reader.size()
+        if source_size.isValid() and source_size.width() > max_width:
+            reader.setScaledSize(QSize(
+                max_width,
+                max(1, round(source_size.height() * max_width / source_size.width())),
+            ))
+        
+        image = reader.read()
         if image.isNull():
             QMessageBox.warning(self, "Error", "Failed to load image.")
             return
         
-        # Scale if too large
-        max_width = 600
         if image.width() > max_width:
+            # Reader could not report a size: cheap box pass first, then
+            # smooth filtering only over the reduced image
+            if image.width() > 4 * max_width:
+                image = image.scaledToWidth(max_width * 2, Qt.TransformationMode.FastTransformation)
             image = image.scaledToWidth(max_width, Qt.TransformationMode.SmoothTransformation)
         
         # Insert into document
-        cursor = self._editor.textCursor()
-        document = self._editor.document()
-        
-        # Create unique name for image resource
-        image_name = f"image_{id(image)}"
-        document.addResource(
-            QTextDocument.ResourceType.ImageResource,
-            image_name,
-            image
-        )
-        
         image_format = QTextImageFormat()
-        image_format.setName(image_name)
+        image_format.setName(self._add_image_resource("image", image))
         image_format.setWidth(image.width())
         image_format.setHeight(image.height())
         
-        cursor.insertImage(image_format)
+        self._editor.textCursor().insertImage(image_format)
+    
+    def _add_image_resource(self, prefix: str, image: QImage) -> str:
+        """Register ``image`` under a content-hash name and return the name."""
+        # Identical images share one resource however often they are inserted
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{image.width()}x{image.height()}:{image.format().value}".encode())
+        digest.update(image.constBits().asstring(image.sizeInBytes()))
+        name = f"{prefix}_{digest.hexdigest()}"
+        
+        document = self._editor.document()
+        url = QUrl(name)
+        resource_type = QTextDocument.ResourceType.ImageResource.value
+        if document.resource(resource_type, url) is None:
+            document.addResource(resource_type, url, image)
+        return name
     
     def insert_table(self) -> None:
         """Insert a table at cursor position."""
@@ -523,53 +1058,14 @@ class WriterWidget(QWidget):
     def insert_latex_equation(self, latex: str) -> None:
         """Insert a LaTeX equation as rendered image."""
         try:
-            # Try to render LaTeX using matplotlib
-            import matplotlib
-            matplotlib.use('Agg')
-            import matplotlib.pyplot as plt
-            from io import BytesIO
-            
-            fig, ax = plt.subplots(figsize=(0.01, 0.01))
-            ax.axis('off')
-            
-            # Render the LaTeX
-            text = ax.text(0.5, 0.5, f"${latex}$", 
-                          transform=ax.transAxes,
-                          fontsize=14,
-                          ha='center', va='center')
-            
-            # Get the bounding box
-            fig.canvas.draw()
-            bbox = text.get_window_extent(fig.canvas.get_renderer())
-            
-            # Resize figure to fit text
-            fig.set_size_inches(bbox.width / fig.dpi + 0.2, bbox.height / fig.dpi + 0.2)
-            
-            # Save to buffer
-            buffer = BytesIO()
-            fig.savefig(buffer, format='png', dpi=150, 
-                       bbox_inches='tight', pad_inches=0.1,
-                       transparent=True)
-            plt.close(fig)
-            
-            buffer.seek(0)
+            # Try to render LaTeX using matplotlib; repeated equations hit the cache
             image = QImage()
-            image.loadFromData(buffer.getvalue())
+            image.loadFromData(render_latex_png(latex))
             
             if not image.isNull():
-                cursor = self._editor.textCursor()
-                document = self._editor.document()
-                
-                image_name = f"latex_{id(image)}"
-                document.addResource(
-                    QTextDocument.ResourceType.ImageResource,
-                    image_name,
-                    image
-                )
-                
                 image_format = QTextImageFormat()
-                image_format.setName(image_name)
-                cursor.insertImage(image_format)
+                image_format.setName(self._add_image_resource("latex", image))
+                self._editor.textCursor().insertImage(image_format)
             
         except ImportError:
             # Matplotlib not available, insert as text placeholder
@@ -590,21 +1086,44 @@ class WriterWidget(QWidget):
     
     def get_current_format(self) -> Dict[str, Any]:
         """Get current text format at cursor for toolbar state updates."""
-        cursor = self._editor.textCursor()
-        char_fmt = cursor.charFormat()
-        block_fmt = cursor.blockFormat()
+        char_fmt = self._editor.textCursor().charFormat()
+        
+        # fontFamilies() rather than fontFamily(), which crashes on formats
+        # with no family set under some PyQt6 builds
+        families = char_fmt.fontFamilies()
+        foreground = char_fmt.foreground().color()
+        background = char_fmt.background().color()
+        key = (
+            families[0] if families else "",
+            char_fmt.fontPointSize(),
+            char_fmt.fontWeight(),
+            char_fmt.fontItalic(),
+            char_fmt.fontUnderline(),
+            char_fmt.fontStrikeOut(),
+            foreground.rgba(),
+            background.rgba(),
+            int(self._editor.alignment()),
+        )
+        
+        # Moving within one run of text yields the same format; reuse the dict
+        cached = self._format_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
         
-        return {
-            "font_family": char_fmt.fontFamily(),
-            "font_size": int(char_fmt.fontPointSize()) if char_fmt.fontPointSize() > 0 else 11,
-            "bold": char_fmt.fontWeight() == QFont.Weight.Bold,
-            "italic": char_fmt.fontItalic(),
-            "underline": char_fmt.fontUnderline(),
-            "strikethrough": char_fmt.fontStrikeOut(),
-            "text_color": char_fmt.foreground().color(),
-            "highlight_color": char_fmt.background().color(),
+        family, point_size, weight, italic, underline, strikethrough = key[:6]
+        current = {
+            "font_family": family,
+            "font_size": int(point_size) if point_size > 0 else 11,
+            "bold": weight == QFont.Weight.Bold,
+            "italic": italic,
+            "underline": underline,
+            "strikethrough": strikethrough,
+            "text_color": foreground,
+            "highlight_color": background,
             "alignment": self._editor.alignment(),
         }
+        self._format_cache = (key, current)
+        return current
     
     def has_changes(self) -> bool:
         """Check if document has unsaved changes."""
@@ -657,26 +1176,50 @@ class WriterWidget(QWidget):
         flags = QTextDocument.FindFlag(0)
         if case_sensitive:
             flags |= QTextDocument.FindFlag.FindCaseSensitively
-        return self._editor.find(text, flags)
+        
+        # Search the document from the caret's position; after a hit the
+        # caret sits at the match end, so find-next resumes right there
+        match = self._editor.document().find(
+            text, self._editor.textCursor().position(), flags
+        )
+        if match.isNull():
+            return False
+        self._editor.setTextCursor(match)
+        self._editor.ensureCursorVisible()
+        return True
     
     def replace_text(self, find: str, replace: str) -> bool:
         """Replace current selection if it matches find text."""
         cursor = self._editor.textCursor()
-        if cursor.selectedText().lower() == find.lower():
+        selected = cursor.selectedText()
+        # Case-insensitive find matches character by character, so a length
+        # mismatch rules the selection out before any case folding
+        if len(selected) == len(find) and selected.casefold() == find.casefold():
             cursor.insertText(replace)
             return True
         return self.find_text(find)
     
     def replace_all(self, find: str, replace: str) -> int:
         """Replace all occurrences. Returns count."""
-        cursor = self._editor.textCursor()
-        cursor.movePosition(QTextCursor.MoveOperation.Start)
-        self._editor.setTextCursor(cursor)
+        if not find:
+            return 0
+        
+        # Search the document forward from each replacement instead of
+        # re-entering the editor's find, as one undo step and one repaint
+        document = self._editor.document()
+        edit_cursor = QTextCursor(document)
+        edit_cursor.beginEditBlock()
+        self._editor.setUpdatesEnabled(False)
         
         count = 0
-        while self._editor.find(find):
-            cursor = self._editor.textCursor()
-            cursor.insertText(replace)
-            count += 1
+        try:
+            match = document.find(find, 0)
+            while not match.isNull():
+                match.insertText(replace)
+                count += 1
+                match = document.find(find, match)
+        finally:
+            edit_cursor.endEditBlock()
+            self._editor.setUpdatesEnabled(True)
         
         return count
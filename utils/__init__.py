@@ -3,13 +3,17 @@ from utils.geometry import (
     scale_point,
     scale_rectangle,
     rotate_point,
+    rotate_points,
     points_to_bounding_rect,
     line_intersection,
+    line_intersections,
     point_distance,
+    point_distance_sq,
     smooth_path_points,
 )
 from utils.file_ops import (
     calculate_file_hash,
+    calculate_file_hashes,
     safe_file_copy,
     ensure_directory_exists,
     get_unique_filename,
@@ -19,6 +23,7 @@ from utils.file_ops import (
 )
 from utils.validators import (
     validate_file_path,
+    clear_file_validation_cache,
     validate_page_number,
     validate_zoom_level,
     validate_rotation,
@@ -31,11 +36,15 @@ __all__ = [
     "scale_point",
     "scale_rectangle",
     "rotate_point",
+    "rotate_points",
     "points_to_bounding_rect",
     "line_intersection",
+    "line_intersections",
     "point_distance",
+    "point_distance_sq",
     "smooth_path_points",
     "calculate_file_hash",
+    "calculate_file_hashes",
     "safe_file_copy",
     "ensure_directory_exists",
     "get_unique_filename",
@@ -43,6 +52,7 @@ __all__ = [
     "write_file_bytes",
     "is_valid_pdf_file",
     "validate_file_path",
+    "clear_file_validation_cache",
     "validate_page_number",
     "validate_zoom_level",
     "validate_rotation",
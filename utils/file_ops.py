@@ -1,10 +1,17 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, Callable, Iterator, Optional, Tuple
+import errno
+import fnmatch
+import functools
 import hashlib
+import mmap
+import re
 import shutil
+import stat
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from core.error_types import (
     Result,
@@ -15,40 +22,174 @@ from core.error_types import (
     FilePermissionError as AppFilePermissionError,
 )
 
+try:
+    import blake3
+except ImportError:  # blake3 is optional - only needed for algorithm="blake3"
+    blake3 = None
+
 logger = logging.getLogger(__name__)
 
+# hashlib.file_digest is new in Python 3.11
+_file_digest = getattr(hashlib, "file_digest", None)
+
+# Files above this size are hashed from a memory map in a single update
+_MMAP_HASH_THRESHOLD = 8 * 1024 * 1024
+
+# Default read size for calculate_file_hash
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+# write_file_bytes writes payloads at least this large with os.write
+_DIRECT_WRITE_THRESHOLD = 64 * 1024
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+# write_file_text encodes texts longer than this in one pass
+_ENCODE_ONCE_THRESHOLD = 1_000_000
+
+# Recursive listings open subdirectories relative to their parent's fd
+_SCAN_BY_FD = os.scandir in os.supports_fd and os.open in os.supports_dir_fd
+_DIRECTORY_FLAGS = (
+    os.O_RDONLY | getattr(os, "O_DIRECTORY", 0) | getattr(os, "O_NOFOLLOW", 0)
+)
+
+# Whether file names differ only by case on this platform's paths
+_CASE_INSENSITIVE_PATHS = os.path.normcase("A") == "a"
+
+# errno values meaning copy_file_range cannot handle this pair of files
+_COPY_RANGE_UNSUPPORTED = {
+    errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF,
+}
+
+
+def _copy_file_range(source_path: Path, destination_path: Path) -> bool:
+    """
+    Copy file contents inside the kernel with os.copy_file_range.
+    
+    Lets copy-on-write file systems share extents instead of copying data.
+    Returns False when the call is unavailable or unsupported for these
+    files, leaving the caller to copy another way.
+    """
+    if not hasattr(os, "copy_file_range"):
+        return False
+    with open(source_path, "rb", buffering=0) as source, \
+            open(destination_path, "wb", buffering=0) as destination:
+        try:
+            while os.copy_file_range(source.fileno(), destination.fileno(), 1 << 30):
+                pass
+        except OSError as error:
+            if error.errno in _COPY_RANGE_UNSUPPORTED:
+                return False
+            raise
+    return True
+
+
+def _new_hasher(algorithm: str) -> Any:
+    """Hash object for ``algorithm``, a hashlib name or "blake3"."""
+    if algorithm == "blake3":
+        if blake3 is None:
+            raise ValueError("blake3 hashing requires the blake3 package")
+        # BLAKE3 splits large inputs across all cores
+        return blake3.blake3(max_threads=blake3.blake3.AUTO)
+    # OpenSSL's SHA-256 already dispatches to SHA-NI where the CPU has it
+    return hashlib.new(algorithm)
+
+
+def _advise_sequential(fd: int) -> None:
+    """Hint the kernel to read ahead aggressively on a front-to-back read."""
+    if not hasattr(os, "posix_fadvise"):
+        return  # Windows and macOS
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass  # Only a hint; some file systems reject it
+
+
+def _stat_or_fail(
+    path: Path,
+    operation: str,
+    description: str = "File",
+) -> Result[os.stat_result]:
+    """
+    Stat a path once, mapping a missing path or denied access to a Failure.
+    
+    Args:
+        path: Path to stat.
+        operation: Operation name recorded on the error.
+        description: What the path is, for the not-found message.
+    
+    Returns:
+        Result containing the stat result.
+    """
+    try:
+        return Success(os.stat(path))
+    except FileNotFoundError:
+        return Failure(AppFileNotFoundError(
+            message=f"{description} not found: {path}",
+            path=path,
+            operation=operation,
+        ))
+    except PermissionError:
+        return Failure(AppFilePermissionError(
+            message=f"Permission denied: {path}",
+            path=path,
+            operation=operation,
+        ))
+
 
 def calculate_file_hash(
     file_path: Path,
     algorithm: str = "sha256",
-    chunk_size: int = 65536,
+    chunk_size: int = _HASH_CHUNK_SIZE,
 ) -> Result[str]:
     """
     Calculate the hash of a file.
     
     Args:
         file_path: Path to the file.
-        algorithm: Hash algorithm to use (sha256, md5, sha1).
+        algorithm: Hash algorithm to use (sha256, md5, sha1, or blake3
+            when the blake3 package is installed).
         chunk_size: Size of chunks to read at a time.
     
     Returns:
         Result containing the hex digest of the hash.
     """
     try:
-        file_path = Path(file_path).resolve()
-        
-        if not file_path.exists():
-            return Failure(AppFileNotFoundError(
-                message=f"File not found: {file_path}",
-                path=file_path,
-                operation="hash",
-            ))
-        
-        hasher = hashlib.new(algorithm)
-        
-        with open(file_path, "rb") as file:
-            for chunk in iter(lambda: file.read(chunk_size), b""):
-                hasher.update(chunk)
+        file_path = Path(file_path)
+        
+        stat_result = _stat_or_fail(file_path, "hash")
+        if stat_result.is_failure():
+            return Failure(stat_result.get_error())
+        
+        # Unbuffered, so each read hands the full chunk straight to the hasher
+        with open(file_path, "rb", buffering=0) as file:
+            _advise_sequential(file.fileno())
+            if stat_result.value.st_size > _MMAP_HASH_THRESHOLD:
+                try:
+                    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        # The hasher walks the mapped pages without copying
+                        # them into Python bytes
+                        hasher = _new_hasher(algorithm)
+                        hasher.update(mapped)
+                        return Success(hasher.hexdigest())
+                except (OSError, ValueError):
+                    pass  # Not mappable; fall back to reading it
+            
+            if _file_digest is not None and chunk_size == _HASH_CHUNK_SIZE:
+                # Python 3.11+: the read/update loop runs in C, with its own
+                # buffer size, so it only stands in for the default chunk size
+                digest = _file_digest(file, lambda: _new_hasher(algorithm))
+                return Success(digest.hexdigest())
+            
+            # One reused buffer instead of a new bytes object per chunk
+            hasher = _new_hasher(algorithm)
+            buffer = bytearray(chunk_size)
+            view = memoryview(buffer)
+            while True:
+                count = file.readinto(buffer)
+                if not count:
+                    break
+                hasher.update(view[:count])
         
         return Success(hasher.hexdigest())
         
@@ -66,6 +207,37 @@ def calculate_file_hash(
         ))
 
 
+def calculate_file_hashes(
+    file_paths: list[Path],
+    algorithm: str = "sha256",
+    max_workers: Optional[int] = None,
+) -> list[Result[str]]:
+    """
+    Calculate the hashes of several files concurrently.
+    
+    hashlib releases the GIL while hashing large buffers, so the files are
+    hashed in parallel on a thread pool.
+    
+    Args:
+        file_paths: Paths to the files.
+        algorithm: Hash algorithm to use (sha256, md5, sha1).
+        max_workers: Number of threads; defaults to the CPU count, up to 8.
+    
+    Returns:
+        One Result per path, in the order of ``file_paths``.
+    """
+    if len(file_paths) < 2:
+        return [calculate_file_hash(path, algorithm) for path in file_paths]
+    
+    if max_workers is None:
+        max_workers = min(8, os.cpu_count() or 1)
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(
+            lambda path: calculate_file_hash(path, algorithm), file_paths
+        ))
+
+
 def safe_file_copy(
     source_path: Path,
     destination_path: Path,
@@ -86,14 +258,17 @@ def safe_file_copy(
         source_path = Path(source_path).resolve()
         destination_path = Path(destination_path).resolve()
         
-        if not source_path.exists():
-            return Failure(AppFileNotFoundError(
-                message=f"Source file not found: {source_path}",
-                path=source_path,
-                operation="copy",
-            ))
+        stat_result = _stat_or_fail(source_path, "copy", "Source file")
+        if stat_result.is_failure():
+            return Failure(stat_result.get_error())
+        source_stat = stat_result.value
         
-        if destination_path.exists() and not overwrite:
+        try:
+            destination_stat = os.stat(destination_path)
+        except FileNotFoundError:
+            destination_stat = None
+        
+        if destination_stat is not None and not overwrite:
             return Failure(FileSystemError(
                 message=f"Destination file already exists: {destination_path}",
                 path=destination_path,
@@ -102,7 +277,21 @@ def safe_file_copy(
         
         destination_path.parent.mkdir(parents=True, exist_ok=True)
         
-        shutil.copy2(source_path, destination_path)
+        # Regular file onto a new or other regular file: copy in the kernel.
+        # Everything else, including copying a file onto itself, goes through
+        # shutil.copy2 and its checks
+        if (
+            stat.S_ISREG(source_stat.st_mode)
+            and (
+                destination_stat is None
+                or (stat.S_ISREG(destination_stat.st_mode)
+                    and not os.path.samestat(source_stat, destination_stat))
+            )
+            and _copy_file_range(source_path, destination_path)
+        ):
+            shutil.copystat(source_path, destination_path)
+        else:
+            shutil.copy2(source_path, destination_path)
         
         logger.debug(f"Copied file: {source_path} -> {destination_path}")
         return Success(destination_path)
@@ -141,12 +330,9 @@ def safe_file_move(
         source_path = Path(source_path).resolve()
         destination_path = Path(destination_path).resolve()
         
-        if not source_path.exists():
-            return Failure(AppFileNotFoundError(
-                message=f"Source file not found: {source_path}",
-                path=source_path,
-                operation="move",
-            ))
+        stat_result = _stat_or_fail(source_path, "move", "Source file")
+        if stat_result.is_failure():
+            return Failure(stat_result.get_error())
         
         if destination_path.exists() and not overwrite:
             return Failure(FileSystemError(
@@ -157,7 +343,14 @@ def safe_file_move(
         
         destination_path.parent.mkdir(parents=True, exist_ok=True)
         
-        shutil.move(str(source_path), str(destination_path))
+        # A same-volume move is a single atomic rename; shutil only needs to
+        # copy and delete across file systems
+        try:
+            os.replace(source_path, destination_path)
+        except OSError as error:
+            if error.errno != errno.EXDEV:
+                raise
+            shutil.move(str(source_path), str(destination_path))
         
         logger.debug(f"Moved file: {source_path} -> {destination_path}")
         return Success(destination_path)
@@ -225,43 +418,67 @@ def get_unique_filename(
     
     directory = Path(directory).resolve()
     
-    candidate = directory / f"{base_name}{extension}"
-    if not candidate.exists():
-        return candidate
+    # One directory listing answers every candidate; when the directory
+    # cannot be listed, fall back to checking candidates one by one
+    try:
+        existing = set(os.listdir(directory))
+    except FileNotFoundError:
+        existing = set()
+    except OSError:
+        existing = None
     
-    counter = 1
-    while True:
-        candidate = directory / f"{base_name} ({counter}){extension}"
-        if not candidate.exists():
-            return candidate
-        counter += 1
-        
-        if counter > 10000:
-            raise RuntimeError("Could not generate unique filename")
+    if existing is not None and _CASE_INSENSITIVE_PATHS:
+        existing = {name.casefold() for name in existing}
+    
+    def is_taken(name: str) -> bool:
+        if existing is None:
+            return (directory / name).exists()
+        return (name.casefold() if _CASE_INSENSITIVE_PATHS else name) in existing
+    
+    name = f"{base_name}{extension}"
+    if not is_taken(name):
+        return directory / name
+    
+    for counter in range(1, 10001):
+        name = f"{base_name} ({counter}){extension}"
+        if not is_taken(name):
+            return directory / name
+    
+    raise RuntimeError("Could not generate unique filename")
 
 
-def read_file_bytes(file_path: Path) -> Result[bytes]:
+def read_file_bytes(
+    file_path: Path,
+    mmap_threshold: Optional[int] = None,
+) -> Result[bytes | memoryview]:
     """
     Read file contents as bytes.
     
     Args:
         file_path: Path to the file.
+        mmap_threshold: If set, files larger than this many bytes are
+            memory-mapped instead of read. The caller should release()
+            the returned memoryview when done; the mapping is closed
+            once it is no longer referenced.
     
     Returns:
-        Result containing the file bytes.
+        Result containing the file bytes, or a read-only memoryview of
+        the mapped file.
     """
     try:
-        file_path = Path(file_path).resolve()
-        
-        if not file_path.exists():
-            return Failure(AppFileNotFoundError(
-                message=f"File not found: {file_path}",
-                path=file_path,
-                operation="read",
-            ))
-        
-        with open(file_path, "rb") as file:
-            return Success(file.read())
+        file_path = Path(file_path)
+        
+        stat_result = _stat_or_fail(file_path, "read")
+        if stat_result.is_failure():
+            return Failure(stat_result.get_error())
+        
+        # The raw file sizes its buffer from fstat and fills it in one read
+        with open(file_path, "rb", buffering=0) as file:
+            _advise_sequential(file.fileno())
+            if mmap_threshold is not None and stat_result.value.st_size > mmap_threshold:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                return Success(memoryview(mapped))
+            return Success(file.readall())
             
     except PermissionError:
         return Failure(AppFilePermissionError(
@@ -305,8 +522,19 @@ def write_file_bytes(
         
         file_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(file_path, "wb") as file:
-            file.write(data)
+        if len(data) >= _DIRECT_WRITE_THRESHOLD:
+            # Large payloads go straight to the descriptor, skipping the
+            # BufferedWriter and its copy
+            fd = os.open(file_path, _WRITE_FLAGS, 0o666)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+            finally:
+                os.close(fd)
+        else:
+            with open(file_path, "wb") as file:
+                file.write(data)
         
         return Success(file_path)
         
@@ -339,14 +567,11 @@ def read_file_text(
         Result containing the file text.
     """
     try:
-        file_path = Path(file_path).resolve()
+        file_path = Path(file_path)
         
-        if not file_path.exists():
-            return Failure(AppFileNotFoundError(
-                message=f"File not found: {file_path}",
-                path=file_path,
-                operation="read",
-            ))
+        stat_result = _stat_or_fail(file_path, "read")
+        if stat_result.is_failure():
+            return Failure(stat_result.get_error())
         
         with open(file_path, "r", encoding=encoding) as file:
             return Success(file.read())
@@ -390,6 +615,13 @@ def write_file_text(
         Result containing the file path.
     """
     try:
+        if len(text) > _ENCODE_ONCE_THRESHOLD:
+            # Encode in one pass and write the bytes directly, instead of
+            # streaming through TextIOWrapper's newline and encode buffers
+            if os.linesep != "\n":
+                text = text.replace("\n", os.linesep)
+            return write_file_bytes(file_path, text.encode(encoding), overwrite=overwrite)
+        
         file_path = Path(file_path).resolve()
         
         if file_path.exists() and not overwrite:
@@ -431,17 +663,17 @@ def is_valid_pdf_file(file_path: Path) -> bool:
         True if the file appears to be a valid PDF.
     """
     try:
-        file_path = Path(file_path).resolve()
-        
-        if not file_path.exists():
-            return False
+        file_path = Path(file_path)
         
         if file_path.suffix.lower() != ".pdf":
             return False
         
-        with open(file_path, "rb") as file:
-            header = file.read(8)
-            return header.startswith(b"%PDF-")
+        # One open and one read; a missing file surfaces as OSError
+        fd = os.open(file_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            return os.read(fd, 5) == b"%PDF-"
+        finally:
+            os.close(fd)
             
     except Exception:
         return False
@@ -458,16 +690,8 @@ def get_file_size(file_path: Path) -> Result[int]:
         Result containing the file size.
     """
     try:
-        file_path = Path(file_path).resolve()
-        
-        if not file_path.exists():
-            return Failure(AppFileNotFoundError(
-                message=f"File not found: {file_path}",
-                path=file_path,
-                operation="stat",
-            ))
-        
-        return Success(file_path.stat().st_size)
+        file_path = Path(file_path)
+        return _stat_or_fail(file_path, "stat").map(lambda st: st.st_size)
         
     except PermissionError:
         return Failure(AppFilePermissionError(
@@ -496,10 +720,10 @@ def delete_file(file_path: Path) -> Result[bool]:
     try:
         file_path = Path(file_path).resolve()
         
-        if not file_path.exists():
+        try:
+            file_path.unlink()
+        except FileNotFoundError:
             return Success(False)
-        
-        file_path.unlink()
         logger.debug(f"Deleted file: {file_path}")
         return Success(True)
         
@@ -517,6 +741,93 @@ def delete_file(file_path: Path) -> Result[bool]:
         ))
 
 
+def _is_path_pattern(pattern: str) -> bool:
+    """Whether a glob pattern spans directories rather than naming files."""
+    return "/" in pattern or os.sep in pattern or "**" in pattern
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_glob(pattern: str) -> Optional[Callable[[str], Any]]:
+    """
+    Compiled name matcher for a glob pattern; None when it matches everything.
+    
+    Case sensitivity follows fnmatch.fnmatch, which is case-insensitive
+    where the platform's paths are.
+    """
+    if pattern == "*":
+        return None
+    flags = re.IGNORECASE if _CASE_INSENSITIVE_PATHS else 0
+    return re.compile(fnmatch.translate(pattern), flags).match
+
+
+def _iter_files(
+    directory: str,
+    match: Optional[Callable[[str], Any]],
+    recursive: bool,
+) -> Iterator[str]:
+    """
+    Yield paths of the files under ``directory`` whose names ``match``
+    accepts (all files when it is None).
+    
+    Entries are filtered by name first, and is_file()/is_dir() are answered
+    from the scandir data, so no entry is stat'ed a second time.
+    """
+    if recursive and _SCAN_BY_FD:
+        fd = os.open(directory, _DIRECTORY_FLAGS)
+        try:
+            yield from _iter_files_at(fd, directory, match)
+        finally:
+            os.close(fd)
+        return
+    
+    pending = [directory]
+    while pending:
+        current = pending.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError:
+            if current is directory:
+                raise
+            continue  # Unreadable subdirectories are skipped, like os.walk
+        with entries:
+            for entry in entries:
+                if recursive and entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif (match is None or match(entry.name)) and entry.is_file():
+                    yield entry.path
+
+
+def _iter_files_at(
+    dir_fd: int,
+    prefix: str,
+    match: Optional[Callable[[str], Any]],
+) -> Iterator[str]:
+    """
+    Recursive ``_iter_files`` over directory descriptors.
+    
+    Subdirectories are opened relative to their parent's descriptor, so the
+    kernel never walks the full path again; only the descriptors of the
+    current directory's ancestors stay open.
+    """
+    subdirectories = []
+    with os.scandir(dir_fd) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirectories.append(entry.name)
+            elif (match is None or match(entry.name)) and entry.is_file():
+                yield os.path.join(prefix, entry.name)
+    
+    for name in subdirectories:
+        try:
+            fd = os.open(name, _DIRECTORY_FLAGS, dir_fd=dir_fd)
+        except OSError:
+            continue  # Unreadable subdirectories are skipped, like os.walk
+        try:
+            yield from _iter_files_at(fd, os.path.join(prefix, name), match)
+        finally:
+            os.close(fd)
+
+
 def list_files_in_directory(
     directory_path: Path,
     pattern: str = "*",
@@ -527,7 +838,9 @@ def list_files_in_directory(
     
     Args:
         directory_path: Directory to list.
-        pattern: Glob pattern to match.
+        pattern: Glob pattern. Plain name patterns are matched during the
+            directory scan; patterns with path separators or ``**`` are
+            handed to Path.glob/rglob.
         recursive: Whether to search recursively.
     
     Returns:
@@ -536,26 +849,26 @@ def list_files_in_directory(
     try:
         directory_path = Path(directory_path).resolve()
         
-        if not directory_path.exists():
-            return Failure(AppFileNotFoundError(
-                message=f"Directory not found: {directory_path}",
-                path=directory_path,
-                operation="list",
-            ))
+        stat_result = _stat_or_fail(directory_path, "list", "Directory")
+        if stat_result.is_failure():
+            return Failure(stat_result.get_error())
         
-        if not directory_path.is_dir():
+        if not stat.S_ISDIR(stat_result.value.st_mode):
             return Failure(FileSystemError(
                 message=f"Path is not a directory: {directory_path}",
                 path=directory_path,
                 operation="list",
             ))
         
-        if recursive:
-            files = list(directory_path.rglob(pattern))
-        else:
-            files = list(directory_path.glob(pattern))
+        if _is_path_pattern(pattern):
+            if recursive:
+                files = directory_path.rglob(pattern)
+            else:
+                files = directory_path.glob(pattern)
+            return Success([f for f in files if f.is_file()])
         
-        return Success([f for f in files if f.is_file()])
+        files = _iter_files(str(directory_path), _compile_glob(pattern), recursive)
+        return Success([Path(path) for path in files])
         
     except PermissionError:
         return Failure(AppFilePermissionError(
@@ -1,27 +1,32 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import List, Tuple, Optional
+from functools import lru_cache
+import copy
+from typing import List, NamedTuple, Tuple, Optional
 import math
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional - fall back to the NumPy worklist
+    njit = None
+
 from PyQt6.QtCore import QPointF, QRectF
-from PyQt6.QtGui import QTransform
 
 
-@dataclass(frozen=True)
-class Point2D:
+class Point2D(NamedTuple):
     """Simple 2D point for geometry calculations."""
     x: float
     y: float
     
     def to_tuple(self) -> Tuple[float, float]:
-        return (self.x, self.y)
+        return self
     
     def to_qpointf(self) -> QPointF:
         return QPointF(self.x, self.y)
 
 
-@dataclass(frozen=True)
-class Rect2D:
+class Rect2D(NamedTuple):
     """Simple 2D rectangle for geometry calculations."""
     x: float
     y: float
@@ -29,12 +34,141 @@ class Rect2D:
     height: float
     
     def to_tuple(self) -> Tuple[float, float, float, float]:
-        return (self.x, self.y, self.width, self.height)
+        return self
     
     def to_qrectf(self) -> QRectF:
         return QRectF(self.x, self.y, self.width, self.height)
 
 
+class PathBuffer:
+    """
+    Growable path stored as parallel x and y float64 arrays.
+    
+    Geometry helpers accept a PathBuffer wherever they accept a list of
+    (x, y) points and work on the contiguous arrays directly.
+    """
+    
+    __slots__ = ("_xs", "_ys", "_count")
+    
+    def __init__(self, points=(), capacity: int = 64):
+        pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        count = len(pts)
+        size = max(capacity, count, 1)
+        
+        self._xs = np.empty(size, dtype=np.float64)
+        self._ys = np.empty(size, dtype=np.float64)
+        self._xs[:count] = pts[:, 0]
+        self._ys[:count] = pts[:, 1]
+        self._count = count
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    @property
+    def xs(self) -> np.ndarray:
+        """View of the x coordinates."""
+        return self._xs[:self._count]
+    
+    @property
+    def ys(self) -> np.ndarray:
+        """View of the y coordinates."""
+        return self._ys[:self._count]
+    
+    def append(self, x: float, y: float) -> None:
+        """Append a point, doubling the backing arrays when full."""
+        if self._count == len(self._xs):
+            size = len(self._xs) * 2
+            self._xs = np.resize(self._xs, size)
+            self._ys = np.resize(self._ys, size)
+        
+        self._xs[self._count] = x
+        self._ys[self._count] = y
+        self._count += 1
+    
+    def to_array(self) -> np.ndarray:
+        """Return the points as a new (N, 2) array."""
+        return np.column_stack((self.xs, self.ys))
+    
+    def to_list(self) -> List[Tuple[float, float]]:
+        """Return the points as a list of (x, y) tuples."""
+        return list(zip(self.xs.tolist(), self.ys.tolist()))
+
+
+# Closed-form PDF to screen affines, one per page rotation. Each composes
+# offset, scale, rotation and the Y flip into (m11, m12, m21, m22, dx, dy),
+# where x' = m11 * x + m21 * y + dx and y' = m12 * x + m22 * y + dy.
+def _compose_rotation_0(w, h, s, ox, oy):
+    return (s, 0.0, 0.0, -s, ox, oy + s * h)
+
+
+def _compose_rotation_90(w, h, s, ox, oy):
+    return (0.0, s, s, 0.0, ox, oy)
+
+
+def _compose_rotation_180(w, h, s, ox, oy):
+    return (-s, 0.0, 0.0, s, ox + s * w, oy)
+
+
+def _compose_rotation_270(w, h, s, ox, oy):
+    return (0.0, -s, -s, 0.0, ox + s * h, oy + s * w)
+
+
+_ROTATION_COMPOSERS = {
+    0: _compose_rotation_0,
+    90: _compose_rotation_90,
+    180: _compose_rotation_180,
+    270: _compose_rotation_270,
+}
+
+_IDENTITY_AFFINE = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+
+def _invert_affine(
+    coefficients: Tuple[float, float, float, float, float, float],
+) -> Tuple[float, float, float, float, float, float]:
+    """Invert an affine in closed form, falling back to identity when singular."""
+    m11, m12, m21, m22, dx, dy = coefficients
+    det = m11 * m22 - m12 * m21
+    if det == 0:
+        return _IDENTITY_AFFINE
+    
+    inv = 1.0 / det
+    return (
+        m22 * inv,
+        -m12 * inv,
+        -m21 * inv,
+        m11 * inv,
+        (m21 * dy - m22 * dx) * inv,
+        (m12 * dx - m11 * dy) * inv,
+    )
+
+
+def _map_rect_corners(
+    coefficients: Tuple[float, float, float, float, float, float],
+    x1: float,
+    y1: float,
+    x2: float,
+    y2: float,
+) -> Rect2D:
+    """
+    Map two opposite rectangle corners through an affine and return the bounds.
+    
+    The page affines only rotate by multiples of 90 degrees, so the image of
+    an axis-aligned rectangle is spanned by the images of two opposite corners.
+    """
+    m11, m12, m21, m22, dx, dy = coefficients
+    
+    ax = m11 * x1 + m21 * y1 + dx
+    ay = m12 * x1 + m22 * y1 + dy
+    bx = m11 * x2 + m21 * y2 + dx
+    by = m12 * x2 + m22 * y2 + dy
+    
+    min_x, max_x = (ax, bx) if ax <= bx else (bx, ax)
+    min_y, max_y = (ay, by) if ay <= by else (by, ay)
+    
+    return Rect2D(min_x, min_y, max_x - min_x, max_y - min_y)
+
+
 class CoordinateTransformer:
     """
     Handles coordinate transformations between PDF space and screen space.
@@ -58,72 +192,75 @@ class CoordinateTransformer:
         self._offset_x = offset_x
         self._offset_y = offset_y
         
-        self._transform = self._build_transform()
-        self._inverse_transform = self._build_inverse_transform()
+        # Affine coefficients as plain floats, mapped without Qt round trips
+        self._coefficients = self._compose_coefficients()
+        self._inverse_coefficients = _invert_affine(self._coefficients)
+    
+    def _compose_coefficients(self) -> Tuple[float, float, float, float, float, float]:
+        """Build the PDF to screen affine as (m11, m12, m21, m22, dx, dy)."""
+        compose = _ROTATION_COMPOSERS.get(self._rotation, _compose_rotation_0)
+        return compose(
+            self._page_width,
+            self._page_height,
+            self._scale,
+            self._offset_x,
+            self._offset_y,
+        )
     
-    def _build_transform(self) -> QTransform:
-        """Build the PDF to screen transformation matrix."""
-        transform = QTransform()
-        
-        transform.translate(self._offset_x, self._offset_y)
+    def transform_points(self, points: np.ndarray, inverse: bool = False) -> np.ndarray:
+        """
+        Transform an (N, 2) array of points in one vectorized pass.
         
-        transform.scale(self._scale, self._scale)
+        Args:
+            points: Points as an (N, 2) array (or anything convertible to one).
+            inverse: Map screen to PDF coordinates instead of PDF to screen.
         
-        if self._rotation == 90:
-            transform.rotate(90)
-            transform.translate(0, -self._page_height)
-        elif self._rotation == 180:
-            transform.rotate(180)
-            transform.translate(-self._page_width, -self._page_height)
-        elif self._rotation == 270:
-            transform.rotate(270)
-            transform.translate(-self._page_width, 0)
-        
-        transform.scale(1, -1)
-        transform.translate(0, -self._page_height)
+        Returns:
+            New (N, 2) float64 array of transformed points.
+        """
+        m11, m12, m21, m22, dx, dy = (
+            self._inverse_coefficients if inverse else self._coefficients
+        )
+        pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        xs = pts[:, 0]
+        ys = pts[:, 1]
         
-        return transform
-    
-    def _build_inverse_transform(self) -> QTransform:
-        """Build the screen to PDF transformation matrix."""
-        inverted, success = self._transform.inverted()
-        if not success:
-            return QTransform()
-        return inverted
+        out = np.empty_like(pts)
+        out[:, 0] = m11 * xs + m21 * ys + dx
+        out[:, 1] = m12 * xs + m22 * ys + dy
+        return out
     
     def pdf_to_screen(self, point: Point2D) -> Point2D:
         """Transform a point from PDF coordinates to screen coordinates."""
-        qt_point = self._transform.map(point.to_qpointf())
-        return Point2D(qt_point.x(), qt_point.y())
+        m11, m12, m21, m22, dx, dy = self._coefficients
+        x, y = point
+        return Point2D(m11 * x + m21 * y + dx, m12 * x + m22 * y + dy)
     
     def screen_to_pdf(self, point: Point2D) -> Point2D:
         """Transform a point from screen coordinates to PDF coordinates."""
-        qt_point = self._inverse_transform.map(point.to_qpointf())
-        return Point2D(qt_point.x(), qt_point.y())
+        m11, m12, m21, m22, dx, dy = self._inverse_coefficients
+        x, y = point
+        return Point2D(m11 * x + m21 * y + dx, m12 * x + m22 * y + dy)
     
     def pdf_rect_to_screen(self, rect: Rect2D) -> Rect2D:
         """Transform a rectangle from PDF coordinates to screen coordinates."""
-        top_left = self.pdf_to_screen(Point2D(rect.x, rect.y + rect.height))
-        bottom_right = self.pdf_to_screen(Point2D(rect.x + rect.width, rect.y))
-        
-        min_x = min(top_left.x, bottom_right.x)
-        min_y = min(top_left.y, bottom_right.y)
-        max_x = max(top_left.x, bottom_right.x)
-        max_y = max(top_left.y, bottom_right.y)
-        
-        return Rect2D(min_x, min_y, max_x - min_x, max_y - min_y)
+        return _map_rect_corners(
+            self._coefficients,
+            rect.x,
+            rect.y + rect.height,
+            rect.x + rect.width,
+            rect.y,
+        )
     
     def screen_rect_to_pdf(self, rect: Rect2D) -> Rect2D:
         """Transform a rectangle from screen coordinates to PDF coordinates."""
-        top_left = self.screen_to_pdf(Point2D(rect.x, rect.y))
-        bottom_right = self.screen_to_pdf(Point2D(rect.x + rect.width, rect.y + rect.height))
-        
-        min_x = min(top_left.x, bottom_right.x)
-        min_y = min(top_left.y, bottom_right.y)
-        max_x = max(top_left.x, bottom_right.x)
-        max_y = max(top_left.y, bottom_right.y)
-        
-        return Rect2D(min_x, min_y, max_x - min_x, max_y - min_y)
+        return _map_rect_corners(
+            self._inverse_coefficients,
+            rect.x,
+            rect.y,
+            rect.x + rect.width,
+            rect.y + rect.height,
+        )
     
     def scale_distance(self, distance: float) -> float:
         """Scale a distance value from PDF to screen space."""
@@ -146,42 +283,56 @@ class CoordinateTransformer:
             self._page_height * self._scale,
         )
     
+    def _derive(
+        self,
+        coefficients: Optional[Tuple[float, float, float, float, float, float]] = None,
+        **fields: float,
+    ) -> CoordinateTransformer:
+        """
+        Shallow-copy this transformer with some fields overridden.
+        
+        Keyword arguments name private fields without the leading underscore.
+        When no coefficients are given they are recomposed from the new fields.
+        """
+        derived = copy.copy(self)
+        for name, value in fields.items():
+            setattr(derived, "_" + name, value)
+        if coefficients is None:
+            coefficients = derived._compose_coefficients()
+        derived._coefficients = coefficients
+        derived._inverse_coefficients = _invert_affine(coefficients)
+        return derived
+    
     def with_scale(self, new_scale: float) -> CoordinateTransformer:
         """Create a new transformer with different scale."""
-        return CoordinateTransformer(
-            self._page_width,
-            self._page_height,
-            new_scale,
-            self._rotation,
-            self._offset_x,
-            self._offset_y,
-        )
+        return self._derive(scale=new_scale)
     
     def with_rotation(self, new_rotation: int) -> CoordinateTransformer:
         """Create a new transformer with different rotation."""
-        return CoordinateTransformer(
-            self._page_width,
-            self._page_height,
-            self._scale,
-            new_rotation,
-            self._offset_x,
-            self._offset_y,
-        )
+        return self._derive(rotation=new_rotation % 360)
     
     def with_offset(self, offset_x: float, offset_y: float) -> CoordinateTransformer:
         """Create a new transformer with different offset."""
-        return CoordinateTransformer(
-            self._page_width,
-            self._page_height,
-            self._scale,
-            self._rotation,
-            offset_x,
-            offset_y,
+        # Panning leaves the scale/rotation block alone and only shifts dx, dy
+        m11, m12, m21, m22, dx, dy = self._coefficients
+        return self._derive(
+            (
+                m11,
+                m12,
+                m21,
+                m22,
+                dx + (offset_x - self._offset_x),
+                dy + (offset_y - self._offset_y),
+            ),
+            offset_x=offset_x,
+            offset_y=offset_y,
         )
 
 
 def scale_point(point: Tuple[float, float], scale: float) -> Tuple[float, float]:
-    """Scale a point by a factor."""
+    """Scale a point by a factor; a factor of 1.0 returns the point itself."""
+    if scale == 1.0:
+        return point
     return (point[0] * scale, point[1] * scale)
 
 
@@ -189,7 +340,9 @@ def scale_rectangle(
     rect: Tuple[float, float, float, float],
     scale: float,
 ) -> Tuple[float, float, float, float]:
-    """Scale a rectangle (x, y, width, height) by a factor."""
+    """Scale a rectangle (x, y, width, height) by a factor; 1.0 returns it as is."""
+    if scale == 1.0:
+        return rect
     return (
         rect[0] * scale,
         rect[1] * scale,
@@ -217,18 +370,54 @@ def rotate_point(
     return (rotated_x + center[0], rotated_y + center[1])
 
 
+def rotate_points(
+    points: np.ndarray,
+    center: Tuple[float, float],
+    angle_degrees: float,
+) -> np.ndarray:
+    """
+    Rotate an (N, 2) array of points around a center by an angle in degrees.
+    
+    Args:
+        points: Points as an (N, 2) array (or anything convertible to one).
+        center: Center of rotation.
+        angle_degrees: Rotation angle in degrees.
+    
+    Returns:
+        New (N, 2) float64 array of rotated points.
+    """
+    angle_rad = math.radians(angle_degrees)
+    cos_a = math.cos(angle_rad)
+    sin_a = math.sin(angle_rad)
+    
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    translated_x = pts[:, 0] - center[0]
+    translated_y = pts[:, 1] - center[1]
+    
+    rotated = np.empty_like(pts)
+    rotated[:, 0] = translated_x * cos_a - translated_y * sin_a + center[0]
+    rotated[:, 1] = translated_x * sin_a + translated_y * cos_a + center[1]
+    return rotated
+
+
 def points_to_bounding_rect(
     points: List[Tuple[float, float]],
     padding: float = 0.0,
 ) -> Tuple[float, float, float, float]:
     """Calculate the bounding rectangle for a list of points."""
-    if not points:
+    if len(points) == 0:
         return (0.0, 0.0, 0.0, 0.0)
     
-    min_x = min(p[0] for p in points) - padding
-    max_x = max(p[0] for p in points) + padding
-    min_y = min(p[1] for p in points) - padding
-    max_y = max(p[1] for p in points) + padding
+    if isinstance(points, PathBuffer):
+        min_x = float(points.xs.min()) - padding
+        max_x = float(points.xs.max()) + padding
+        min_y = float(points.ys.min()) - padding
+        max_y = float(points.ys.max()) + padding
+        return (min_x, min_y, max_x - min_x, max_y - min_y)
+    
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    min_x, min_y = (pts.min(axis=0) - padding).tolist()
+    max_x, max_y = (pts.max(axis=0) + padding).tolist()
     
     return (min_x, min_y, max_x - min_x, max_y - min_y)
 
@@ -264,6 +453,49 @@ def line_intersection(
     return None
 
 
+def line_intersections(
+    line1_starts: np.ndarray,
+    line1_ends: np.ndarray,
+    line2_starts: np.ndarray,
+    line2_ends: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Intersect segment pairs in bulk; the vectorized form of line_intersection.
+    
+    Args:
+        line1_starts: (N, 2) start points of the first segments.
+        line1_ends: (N, 2) end points of the first segments.
+        line2_starts: (N, 2) start points of the second segments.
+        line2_ends: (N, 2) end points of the second segments.
+    
+    Returns:
+        Tuple of an (N,) boolean hit mask and an (N, 2) array of intersection
+        points, NaN where the pair does not intersect or is parallel.
+    """
+    a = np.asarray(line1_starts, dtype=np.float64).reshape(-1, 2)
+    b = np.asarray(line1_ends, dtype=np.float64).reshape(-1, 2)
+    c = np.asarray(line2_starts, dtype=np.float64).reshape(-1, 2)
+    d = np.asarray(line2_ends, dtype=np.float64).reshape(-1, 2)
+    
+    ab = a - b
+    cd = c - d
+    ac = a - c
+    
+    denominator = ab[:, 0] * cd[:, 1] - ab[:, 1] * cd[:, 0]
+    nonparallel = np.abs(denominator) >= 1e-10
+    denominator = np.where(nonparallel, denominator, 1.0)
+    
+    t = (ac[:, 0] * cd[:, 1] - ac[:, 1] * cd[:, 0]) / denominator
+    u = -(ab[:, 0] * ac[:, 1] - ab[:, 1] * ac[:, 0]) / denominator
+    
+    hit = nonparallel & (t >= 0) & (t <= 1) & (u >= 0) & (u <= 1)
+    
+    intersections = a - t[:, None] * ab
+    intersections[~hit] = np.nan
+    
+    return hit, intersections
+
+
 def point_distance(
     point1: Tuple[float, float],
     point2: Tuple[float, float],
@@ -274,6 +506,20 @@ def point_distance(
     return math.sqrt(dx * dx + dy * dy)
 
 
+def point_distance_sq(
+    point1: Tuple[float, float],
+    point2: Tuple[float, float],
+) -> float:
+    """
+    Calculate the squared Euclidean distance between two points.
+    
+    Cheaper than point_distance when only comparing or ordering distances.
+    """
+    dx = point2[0] - point1[0]
+    dy = point2[1] - point1[1]
+    return dx * dx + dy * dy
+
+
 def smooth_path_points(
     points: List[Tuple[float, float]],
     smoothing_factor: float = 0.5,
@@ -293,26 +539,34 @@ def smooth_path_points(
     
     smoothing_factor = max(0.0, min(1.0, smoothing_factor))
     
-    smoothed = [points[0]]
+    if isinstance(points, PathBuffer):
+        return PathBuffer(smooth_path_points(points.to_array(), smoothing_factor))
     
-    for i in range(1, len(points) - 1):
-        prev_point = points[i - 1]
-        current_point = points[i]
-        next_point = points[i + 1]
-        
-        avg_x = (prev_point[0] + current_point[0] + next_point[0]) / 3
-        avg_y = (prev_point[1] + current_point[1] + next_point[1]) / 3
-        
-        smoothed_x = current_point[0] + smoothing_factor * (avg_x - current_point[0])
-        smoothed_y = current_point[1] + smoothing_factor * (avg_y - current_point[1])
-        
-        smoothed.append((smoothed_x, smoothed_y))
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    current = pts[1:-1]
+    
+    # 3-tap moving average over every interior point at once
+    average = (pts[:-2] + current + pts[2:]) / 3
+    interior = current + smoothing_factor * (average - current)
+    
+    if isinstance(points, np.ndarray):
+        smoothed = pts.copy()
+        smoothed[1:-1] = interior
+        return smoothed
     
+    smoothed = [points[0]]
+    smoothed.extend(zip(interior[:, 0].tolist(), interior[:, 1].tolist()))
     smoothed.append(points[-1])
     
     return smoothed
 
 
+@lru_cache(maxsize=32)
+def _arrow_head_half_width(head_length: float, head_angle: float) -> float:
+    """Half width of an arrow head's base; arrows reuse a handful of styles."""
+    return head_length * math.tan(math.radians(head_angle))
+
+
 def calculate_arrow_head_points(
     start: Tuple[float, float],
     end: Tuple[float, float],
@@ -344,18 +598,17 @@ def calculate_arrow_head_points(
     base_x = end[0] - unit_dx * head_length
     base_y = end[1] - unit_dy * head_length
     
-    angle_rad = math.radians(head_angle)
-    cos_a = math.cos(angle_rad)
-    sin_a = math.sin(angle_rad)
+    half_width = _arrow_head_half_width(head_length, head_angle)
     
-    perp_dx = -unit_dy
-    perp_dy = unit_dx
+    # Perpendicular (-unit_dy, unit_dx) scaled to the head's half width
+    offset_x = -unit_dy * half_width
+    offset_y = unit_dx * half_width
     
-    left_x = base_x + perp_dx * head_length * math.tan(angle_rad)
-    left_y = base_y + perp_dy * head_length * math.tan(angle_rad)
+    left_x = base_x + offset_x
+    left_y = base_y + offset_y
     
-    right_x = base_x - perp_dx * head_length * math.tan(angle_rad)
-    right_y = base_y - perp_dy * head_length * math.tan(angle_rad)
+    right_x = base_x - offset_x
+    right_y = base_y - offset_y
     
     return [(left_x, left_y), end, (right_x, right_y)]
 
@@ -366,6 +619,15 @@ def point_to_line_distance(
     line_end: Tuple[float, float],
 ) -> float:
     """Calculate the perpendicular distance from a point to a line segment."""
+    return math.sqrt(_point_to_line_distance_sq(point, line_start, line_end))
+
+
+def _point_to_line_distance_sq(
+    point: Tuple[float, float],
+    line_start: Tuple[float, float],
+    line_end: Tuple[float, float],
+) -> float:
+    """Squared distance from a point to a line segment."""
     px, py = point
     x1, y1 = line_start
     x2, y2 = line_end
@@ -376,14 +638,114 @@ def point_to_line_distance(
     length_squared = dx * dx + dy * dy
     
     if length_squared < 1e-10:
-        return point_distance(point, line_start)
+        return point_distance_sq(point, line_start)
     
     t = max(0, min(1, ((px - x1) * dx + (py - y1) * dy) / length_squared))
     
     projection_x = x1 + t * dx
     projection_y = y1 + t * dy
     
-    return point_distance(point, (projection_x, projection_y))
+    return point_distance_sq(point, (projection_x, projection_y))
+
+
+def _segment_distances_sq(
+    points: np.ndarray,
+    line_start: np.ndarray,
+    line_end: np.ndarray,
+) -> np.ndarray:
+    """Squared distance from each of an (N, 2) array of points to a line segment."""
+    delta = line_end - line_start
+    length_squared = float(delta @ delta)
+    
+    offsets = points - line_start
+    if length_squared < 1e-10:
+        return (offsets * offsets).sum(axis=1)
+    
+    t = np.clip((offsets @ delta) / length_squared, 0.0, 1.0)
+    residual = offsets - t[:, None] * delta
+    return (residual * residual).sum(axis=1)
+
+
+def _rdp_keep_mask(pts: np.ndarray, tolerance_sq: float) -> np.ndarray:
+    """Mark the points of an (N, 2) array that Ramer-Douglas-Peucker keeps."""
+    keep = np.zeros(len(pts), dtype=np.bool_)
+    keep[0] = keep[-1] = True
+    
+    # Worklist of (first, last) index ranges instead of recursing on slices
+    stack = [(0, len(pts) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        
+        distances_sq = _segment_distances_sq(pts[first + 1:last], pts[first], pts[last])
+        offset = int(distances_sq.argmax())
+        
+        if distances_sq[offset] > tolerance_sq:
+            split = first + 1 + offset
+            keep[split] = True
+            stack.append((split, last))
+            stack.append((first, split))
+    
+    return keep
+
+
+def _rdp_keep_mask_loop(xs: np.ndarray, ys: np.ndarray, tolerance_sq: float) -> np.ndarray:
+    """Scalar-loop twin of _rdp_keep_mask over separate x and y arrays."""
+    count = xs.shape[0]
+    keep = np.zeros(count, dtype=np.bool_)
+    keep[0] = True
+    keep[count - 1] = True
+    
+    # Each pending range ends at a distinct kept index, so N slots suffice
+    stack = np.empty((count, 2), dtype=np.int64)
+    stack[0, 0] = 0
+    stack[0, 1] = count - 1
+    top = 1
+    while top > 0:
+        top -= 1
+        first = stack[top, 0]
+        last = stack[top, 1]
+        if last - first < 2:
+            continue
+        
+        ax = xs[first]
+        ay = ys[first]
+        dx = xs[last] - ax
+        dy = ys[last] - ay
+        length_squared = dx * dx + dy * dy
+        
+        max_distance_sq = -1.0
+        split = first + 1
+        for i in range(first + 1, last):
+            ox = xs[i] - ax
+            oy = ys[i] - ay
+            if length_squared >= 1e-10:
+                t = (ox * dx + oy * dy) / length_squared
+                t = 0.0 if t < 0.0 else (1.0 if t > 1.0 else t)
+                ox -= t * dx
+                oy -= t * dy
+            distance_sq = ox * ox + oy * oy
+            if distance_sq > max_distance_sq:
+                max_distance_sq = distance_sq
+                split = i
+        
+        if max_distance_sq > tolerance_sq:
+            keep[split] = True
+            stack[top, 0] = split
+            stack[top, 1] = last
+            top += 1
+            stack[top, 0] = first
+            stack[top, 1] = split
+            top += 1
+    
+    return keep
+
+
+if njit is not None:
+    _rdp_keep_mask_jit = njit(cache=True, fastmath=True)(_rdp_keep_mask_loop)
+else:
+    _rdp_keep_mask_jit = None
 
 
 def simplify_path(
@@ -403,19 +765,22 @@ def simplify_path(
     if len(points) < 3:
         return points
     
-    max_distance = 0.0
-    max_index = 0
+    if isinstance(points, PathBuffer):
+        return PathBuffer(simplify_path(points.to_array(), tolerance))
     
-    for i in range(1, len(points) - 1):
-        distance = point_to_line_distance(points[i], points[0], points[-1])
-        if distance > max_distance:
-            max_distance = distance
-            max_index = i
+    # Compare squared distances; a negative tolerance keeps every point
+    tolerance_sq = float(tolerance * tolerance) if tolerance >= 0 else -1.0
     
-    if max_distance > tolerance:
-        left_simplified = simplify_path(points[:max_index + 1], tolerance)
-        right_simplified = simplify_path(points[max_index:], tolerance)
-        
-        return left_simplified[:-1] + right_simplified
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if _rdp_keep_mask_jit is not None:
+        keep = _rdp_keep_mask_jit(
+            np.ascontiguousarray(pts[:, 0]),
+            np.ascontiguousarray(pts[:, 1]),
+            tolerance_sq,
+        )
+    else:
+        keep = _rdp_keep_mask(pts, tolerance_sq)
     
-    return [points[0], points[-1]]
+    if isinstance(points, np.ndarray):
+        return points[keep]
+    return [points[i] for i in np.flatnonzero(keep).tolist()]
@@ -1,7 +1,11 @@
 from __future__ import annotations
+from functools import lru_cache
+from operator import index as _index
 from pathlib import Path
 from typing import Tuple, Optional
+import os
 import re
+import stat
 
 from core.error_types import (
     Result,
@@ -11,6 +15,11 @@ from core.error_types import (
 )
 
 
+_HEX_COLOR_PATTERN = re.compile(r'^[0-9a-fA-F]{6}([0-9a-fA-F]{2})?$')
+
+_NUMERIC = (int, float)
+
+
 def validate_file_path(
     file_path: str | Path,
     must_exist: bool = True,
@@ -28,32 +37,38 @@ def validate_file_path(
         Result containing the validated Path or validation error.
     """
     try:
-        path = Path(file_path).resolve()
+        path = _resolve_path(os.fspath(file_path))
     except Exception:
-        return Failure(ValidationError(
-            message="Invalid path format",
-            field_name="file_path",
-            invalid_value=str(file_path),
-        ))
+        path = None
     
-    if must_exist and not path.exists():
+    if path is None:
         return Failure(ValidationError(
-            message="File does not exist",
+            message="Invalid path format",
             field_name="file_path",
             invalid_value=str(file_path),
         ))
     
-    if must_exist and not path.is_file():
-        return Failure(ValidationError(
-            message="Path is not a file",
-            field_name="file_path",
-            invalid_value=str(file_path),
-        ))
+    if must_exist:
+        # Existence is never cached; one stat answers both checks
+        try:
+            mode = path.stat().st_mode
+        except (OSError, ValueError):
+            return Failure(ValidationError(
+                message="File does not exist",
+                field_name="file_path",
+                invalid_value=str(file_path),
+            ))
+        
+        if not stat.S_ISREG(mode):
+            return Failure(ValidationError(
+                message="Path is not a file",
+                field_name="file_path",
+                invalid_value=str(file_path),
+            ))
     
     if allowed_extensions:
-        normalized_extensions = [ext.lower() if ext.startswith('.') else f'.{ext.lower()}' 
-                                 for ext in allowed_extensions]
-        if path.suffix.lower() not in normalized_extensions:
+        normalized_extensions, extension_set = _normalize_extensions(tuple(allowed_extensions))
+        if path.suffix.lower() not in extension_set:
             return Failure(ValidationError(
                 message=f"Invalid file extension. Allowed: {', '.join(normalized_extensions)}",
                 field_name="file_path",
@@ -63,6 +78,32 @@ def validate_file_path(
     return Success(path)
 
 
+def clear_file_validation_cache() -> None:
+    """Forget cached path resolutions (e.g. after re-pointing symlinks)."""
+    _resolve_path.cache_clear()
+
+
+@lru_cache(maxsize=256)
+def _resolve_path(file_path: str) -> Optional[Path]:
+    """Resolve a path string, or None when it cannot be resolved."""
+    try:
+        return Path(file_path).resolve()
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=64)
+def _normalize_extensions(
+    extensions: Tuple[str, ...],
+) -> Tuple[Tuple[str, ...], frozenset[str]]:
+    """Lower-case and dot-prefix extensions, in order and as a lookup set."""
+    normalized = tuple(
+        ext.lower() if ext.startswith('.') else f'.{ext.lower()}'
+        for ext in extensions
+    )
+    return normalized, frozenset(normalized)
+
+
 def validate_page_number(
     page_number: int,
     total_pages: int,
@@ -82,7 +123,13 @@ def validate_page_number(
     min_page = 0 if zero_based else 1
     max_page = total_pages - 1 if zero_based else total_pages
     
-    if not isinstance(page_number, int):
+    # operator.index accepts int-likes (e.g. NumPy integers) but not floats;
+    # bool is an int subclass and is rejected explicitly
+    try:
+        if isinstance(page_number, bool):
+            raise TypeError
+        page_number = _index(page_number)
+    except TypeError:
         return Failure(ValidationError(
             message="Page number must be an integer",
             field_name="page_number",
@@ -122,20 +169,14 @@ def validate_zoom_level(
     Returns:
         Result containing the validated (and clamped) zoom level.
     """
-    if not isinstance(zoom_level, (int, float)):
+    if not isinstance(zoom_level, _NUMERIC):
         return Failure(ValidationError(
             message="Zoom level must be a number",
             field_name="zoom_level",
             invalid_value=str(zoom_level),
         ))
     
-    if zoom_level < min_zoom:
-        return Success(min_zoom)
-    
-    if zoom_level > max_zoom:
-        return Success(max_zoom)
-    
-    return Success(float(zoom_level))
+    return Success(min(max(float(zoom_level), min_zoom), max_zoom))
 
 
 def validate_rotation(rotation: int) -> Result[int]:
@@ -157,9 +198,8 @@ def validate_rotation(rotation: int) -> Result[int]:
     
     normalized = rotation % 360
     
-    valid_rotations = [0, 90, 180, 270]
-    
-    closest = min(valid_rotations, key=lambda x: abs(x - normalized))
+    # Nearest multiple of 90, ties rounding down; 316-359 stay at 270
+    closest = min((normalized + 44) // 90 * 90, 270)
     
     return Success(closest)
 
@@ -186,9 +226,7 @@ def validate_color_hex(color_hex: str) -> Result[str]:
     if color_hex.startswith("#"):
         color_hex = color_hex[1:]
     
-    hex_pattern = re.compile(r'^[0-9a-fA-F]{6}([0-9a-fA-F]{2})?$')
-    
-    if not hex_pattern.match(color_hex):
+    if not _HEX_COLOR_PATTERN.match(color_hex):
         return Failure(ValidationError(
             message="Invalid hex color format. Use #RRGGBB or #RRGGBBAA",
             field_name="color",
@@ -223,13 +261,17 @@ def validate_annotation_bounds(
     
     x, y, width, height = bounds
     
-    for i, value in enumerate([x, y, width, height]):
-        if not isinstance(value, (int, float)):
-            return Failure(ValidationError(
-                message="All bounds values must be numbers",
-                field_name="bounds",
-                invalid_value=str(bounds),
-            ))
+    if not (
+        isinstance(x, _NUMERIC)
+        and isinstance(y, _NUMERIC)
+        and isinstance(width, _NUMERIC)
+        and isinstance(height, _NUMERIC)
+    ):
+        return Failure(ValidationError(
+            message="All bounds values must be numbers",
+            field_name="bounds",
+            invalid_value=str(bounds),
+        ))
     
     if width <= 0 or height <= 0:
         return Failure(ValidationError(
@@ -269,7 +311,7 @@ def validate_percentage(
     Returns:
         Result containing validated percentage.
     """
-    if not isinstance(value, (int, float)):
+    if not isinstance(value, _NUMERIC):
         return Failure(ValidationError(
             message=f"{field_name} must be a number",
             field_name=field_name,
@@ -360,7 +402,7 @@ def validate_positive_number(
     Returns:
         Result containing validated number.
     """
-    if not isinstance(value, (int, float)):
+    if not isinstance(value, _NUMERIC):
         return Failure(ValidationError(
             message=f"{field_name} must be a number",
             field_name=field_name,